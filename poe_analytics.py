@@ -0,0 +1,56 @@
+# poe_analytics.py
+from collections import namedtuple
+
+import numpy as np
+
+SeriesStats = namedtuple("SeriesStats", [
+    "total_used", "active_days", "average_daily",
+    "highest_day", "highest_usage", "lowest_day", "lowest_usage",
+    "days_over", "days_under",
+    "remaining", "days_until_reset", "recent_average",
+    "projected_usage", "projected_remaining", "recommended_daily",
+])
+
+
+def series_stats(series, range_stats, days_until_reset, recent_days=7):
+    # everything the analytics panel shows for one usage series; totals and target counts come from
+    # the store's range aggregates (poe_store.RangeStats for the same days), the rest from the
+    # arrays. Fields that can't be computed for the range are None
+    used = np.asarray(series.used)
+    if len(used) == 0:
+        return SeriesStats(0, 0, None, None, None, None, None, 0, 0,
+                           None, days_until_reset, None, None, None, None)
+
+    total_used = range_stats.total_used
+    active_days = range_stats.active_days
+    days_over = range_stats.days_over
+    days_under = range_stats.days_under
+
+    # highest and lowest day only look at days with usage
+    highest_day = highest_usage = lowest_day = lowest_usage = None
+    average_daily = None
+    if active_days:
+        average_daily = total_used / active_days
+        positions = np.flatnonzero(used > 0)
+        highest = positions[np.argmax(used[positions])]
+        lowest = positions[np.argmin(used[positions])]
+        highest_day, highest_usage = series.dates[highest], int(used[highest])
+        lowest_day, lowest_usage = series.dates[lowest], int(used[lowest])
+
+    # extrapolate the average of recent days with usage to the next reset
+    remaining = int(series.remaining[-1])
+    recent_average = projected_usage = projected_remaining = recommended_daily = None
+    if days_until_reset > 0:
+        recent = used[-recent_days:]
+        recent = recent[recent > 0]
+        if len(recent):
+            recent_average = float(recent.mean())
+            projected_usage = recent_average * days_until_reset
+            projected_remaining = max(remaining - projected_usage, 0)
+            recommended_daily = remaining / days_until_reset
+
+    return SeriesStats(total_used, active_days, average_daily,
+                       highest_day, highest_usage, lowest_day, lowest_usage,
+                       days_over, days_under,
+                       remaining, days_until_reset, recent_average,
+                       projected_usage, projected_remaining, recommended_daily)
@@ -0,0 +1,383 @@
+# poe_charts.py
+import queue
+import threading
+from collections import OrderedDict, namedtuple
+
+# a finished analytics chart: its image as PPM bytes and what the stats panel showed next to it
+ChartRender = namedtuple("ChartRender", ["image", "stats", "daily_target"])
+
+
+class RenderCache:
+    # least recently used chart renders, bounded by the memory their pixels take. Entries live
+    # within a scope (data version, day, theme); asking with a new scope drops everything since
+    # none of the old renders can be shown again
+    def __init__(self, budget=48 * 1024 * 1024):
+        self.budget = budget
+        self.size = 0
+        self.scope = None
+        self.renders = OrderedDict()
+
+    def get(self, scope, key):
+        if scope != self.scope:
+            self.clear()
+            self.scope = scope
+            return None
+        render = self.renders.get(key)
+        if render is not None:
+            self.renders.move_to_end(key)
+        return render
+
+    def put(self, scope, key, render):
+        if scope != self.scope:
+            self.clear()
+            self.scope = scope
+        if key in self.renders:
+            self.size -= render_size(self.renders.pop(key))
+        self.renders[key] = render
+        self.size += render_size(render)
+
+        # evict oldest first, the newest render always stays
+        while self.size > self.budget and len(self.renders) > 1:
+            _, old = self.renders.popitem(last=False)
+            self.size -= render_size(old)
+
+    def clear(self):
+        self.renders.clear()
+        self.size = 0
+
+
+def render_size(render):
+    # bytes of pixels held by a render
+    return len(render.image)
+
+
+def render_image(draw, width, height, dpi=100, stale=lambda: False):
+    # draw(fig) adds a chart's artists to an offscreen figure, which Agg rasterizes to PPM bytes
+    # that a Tk PhotoImage can load directly. Only touches objects it creates, so it is safe to run
+    # off the Tk thread. Returns None without rasterizing if stale() says nobody wants it anymore
+    import numpy as np
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(width / dpi, height / dpi), dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    draw(fig)
+    if stale():
+        return None
+    canvas.draw()
+
+    pixels = np.asarray(canvas.buffer_rgba())
+    rows, columns = pixels.shape[:2]
+    return b"P6 %d %d 255\n" % (columns, rows) + pixels[:, :, :3].tobytes()
+
+
+class ChartRenderer:
+    # renders charts on a worker thread. Every submit() takes a new generation number and makes
+    # the older ones stale: a stale job still waiting is skipped and a stale result is dropped.
+    # Tk isn't thread safe, so results are picked up on the Tk thread by polling with after()
+    poll_interval = 30
+
+    def __init__(self, root):
+        self.root = root
+        self.generation = 0
+        self.pending = 0
+        self.poll_job = None
+        self.jobs = queue.Queue()
+        self.results = queue.Queue()
+        threading.Thread(target=self.work, daemon=True).start()
+
+    def submit(self, draw, width, height, on_done, on_error=None):
+        # on_done(image) or on_error(exception) runs on the Tk thread, only if nothing newer
+        # was submitted in the meantime
+        self.generation += 1
+        self.pending += 1
+        self.jobs.put((self.generation, draw, width, height, on_done, on_error))
+        if self.poll_job is None:
+            self.poll_job = self.root.after(self.poll_interval, self.poll)
+        return self.generation
+
+    def cancel(self):
+        # make everything submitted so far stale
+        self.generation += 1
+
+    def work(self):
+        while True:
+            generation, draw, width, height, on_done, on_error = self.jobs.get()
+            image = error = None
+            if generation == self.generation:
+                try:
+                    image = render_image(draw, width, height, stale=lambda: generation != self.generation)
+                except Exception as e:
+                    error = e
+            self.results.put((generation, image, error, on_done, on_error))
+
+    def poll(self):
+        self.poll_job = None
+        while True:
+            try:
+                generation, image, error, on_done, on_error = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.pending -= 1
+            if generation != self.generation:
+                continue
+            if error is None:
+                on_done(image)
+            elif on_error is not None:
+                on_error(error)
+        if self.pending:
+            self.poll_job = self.root.after(self.poll_interval, self.poll)
+
+
+# ---- level of detail ----
+
+# long ranges are drawn per week or per billing period instead of per day, whichever is the finest
+# that leaves every bar or point at least MIN_BUCKET_PIXELS of the plot width
+LEVELS = ["day", "week", "period"]
+LEVEL_NAMES = {"day": "Date", "week": "Week", "period": "Billing Period"}
+MIN_BUCKET_PIXELS = 8
+
+# usage grouped into consecutive buckets of days: where each starts and ends (indices into the
+# series), how many days it holds and the sum, daily mean and busiest day of its usage
+Buckets = namedtuple("Buckets", ["level", "starts", "ends", "lengths", "sums", "means", "maxes"])
+
+
+def bucket_starts(dates, level, period_starts=()):
+    # indices into the daily series where a new bucket begins
+    import numpy as np
+
+    days = np.arange(np.datetime64(dates[0], "D"), np.datetime64(dates[-1], "D") + 1)
+    if level == "day":
+        return np.arange(len(days))
+    if level == "week":
+        # weeks start on Monday, day 0 of datetime64 (1970-01-01) was a Thursday
+        starts = (days.astype(np.int64) + 3) % 7 == 0
+    else:
+        starts = np.isin(days, np.array(period_starts, dtype="datetime64[D]"))
+    starts[0] = True
+    return np.flatnonzero(starts)
+
+
+def bucket_usage(dates, usage_data, width, period_starts=()):
+    # group a daily series at the finest level that fits in width pixels, the coarsest otherwise
+    import numpy as np
+
+    for level in LEVELS:
+        starts = bucket_starts(dates, level, period_starts)
+        if len(starts) * MIN_BUCKET_PIXELS <= width:
+            break
+
+    used = np.asarray(usage_data)
+    lengths = np.diff(np.append(starts, len(used)))
+    sums = np.add.reduceat(used, starts)
+    return Buckets(level, starts, starts + lengths - 1, lengths, sums, sums / lengths,
+                   np.maximum.reduceat(used, starts))
+
+
+def set_bucket_ticks(ax, dates, indices, level):
+    # about ten date labels along the x axis, positions are bucket numbers
+    fmt = "%m/%d/%y" if level == "period" else "%m/%d"
+    step = max(1, len(indices) // 10)
+    ax.set_xticks(range(0, len(indices), step))
+    ax.set_xticklabels([dates[i].strftime(fmt) for i in indices[::step]], rotation=45, ha='right')
+
+
+# ---- charts, each adds its artists to an empty figure ----
+
+def draw_no_data(fig):
+    ax = fig.add_subplot(111)
+    ax.text(0.5, 0.5, "No data available for selected period", 
+           horizontalalignment='center', verticalalignment='center')
+
+
+def draw_daily_usage(fig, colors, dates, usage_data, daily_target, period_starts=()):
+    import numpy as np
+
+    if not dates:
+        # An empty range has no buckets
+        draw_no_data(fig)
+        return
+
+    ax = fig.add_subplot(111)
+
+    # One bar per day while they fit, otherwise the daily average per week or billing period
+    buckets = bucket_usage(dates, usage_data, fig.bbox.width * 0.85, period_starts)
+    positions = np.arange(len(buckets.starts))
+
+    # Create bar colors based on usage vs target
+    palette = np.array([colors["good"], colors["warning"], colors["danger"]])
+    levels = np.select([buckets.means > daily_target * 1.2, buckets.means > daily_target], [2, 1], default=0)
+
+    # Plot bars
+    ax.bar(positions, buckets.means, color=palette[levels].tolist(), alpha=0.8)
+
+    # grouped bars also mark their busiest day
+    if buckets.level != "day":
+        ax.plot(positions, buckets.maxes, linestyle='none', marker='_', markersize=8, 
+               color=colors["danger"], label='Busiest Day')
+
+    # Add target line
+    ax.axhline(y=daily_target, color='r', linestyle='--', alpha=0.7, label='Daily Target')
+
+    # Add labels and title
+    ax.set_xlabel(LEVEL_NAMES[buckets.level])
+    if buckets.level == "day":
+        ax.set_ylabel('Credits Used')
+        ax.set_title('Daily Credit Usage')
+    else:
+        ax.set_ylabel('Average Daily Credits Used')
+        ax.set_title(f'Daily Credit Usage by {LEVEL_NAMES[buckets.level]}')
+
+    # Add legend
+    ax.legend()
+
+    # Rotate x-axis labels for better readability, grouped bars are labelled by their first day
+    set_bucket_ticks(ax, dates, buckets.starts, buckets.level)
+
+    # Adjust layout
+    fig.tight_layout()
+
+
+def draw_usage_vs_target(fig, colors, dates, usage_data, daily_target, period_starts=()):
+    import numpy as np
+
+    if not dates:
+        # An empty range has no buckets
+        draw_no_data(fig)
+        return
+
+    ax = fig.add_subplot(111)
+
+    # One point per day while they fit, otherwise one at the end of each week or billing period
+    buckets = bucket_usage(dates, usage_data, fig.bbox.width * 0.85, period_starts)
+    positions = np.arange(len(buckets.starts))
+
+    # Calculate cumulative usage
+    cumulative_usage = np.cumsum(buckets.sums)
+
+    # Calculate ideal usage line
+    ideal_usage = daily_target * np.cumsum(buckets.lengths)
+
+    # Plot lines
+    ax.plot(positions, cumulative_usage, 'b-', marker='o', 
+           linewidth=2, label='Actual Usage')
+    ax.plot(positions, ideal_usage, 'r--', 
+           linewidth=2, label='Target Usage')
+
+    # Fill between
+    ax.fill_between(positions, cumulative_usage, ideal_usage, 
+                   where=cumulative_usage > ideal_usage, 
+                   color=colors["danger"], alpha=0.3, interpolate=True)
+    ax.fill_between(positions, cumulative_usage, ideal_usage, 
+                   where=cumulative_usage <= ideal_usage, 
+                   color=colors["good"], alpha=0.3, interpolate=True)
+
+    # Add labels and title
+    ax.set_xlabel(LEVEL_NAMES[buckets.level])
+    ax.set_ylabel('Cumulative Credits Used')
+    ax.set_title('Cumulative Usage vs Target')
+
+    # Add legend
+    ax.legend()
+
+    # Rotate x-axis labels for better readability, points are labelled by the day they run up to
+    set_bucket_ticks(ax, dates, buckets.ends, buckets.level)
+
+    # Adjust layout
+    fig.tight_layout()
+
+
+def draw_remaining_credits(fig, colors, dates, remaining_data, ideal_remaining):
+    import numpy as np
+
+    ax = fig.add_subplot(111)
+
+    # Plot line
+    ax.plot([d.strftime("%m/%d") for d in dates], remaining_data, 'b-', marker='o', 
+           linewidth=2, label='Remaining Credits')
+
+    # Add ideal remaining line, restarting at every reset in the range
+    ax.plot([d.strftime("%m/%d") for d in dates], ideal_remaining, 'r--', 
+           linewidth=2, label='Ideal Remaining')
+
+    # Fill between
+    ax.fill_between([d.strftime("%m/%d") for d in dates], remaining_data, ideal_remaining, 
+                   where=np.array(remaining_data) < np.array(ideal_remaining), 
+                   color=colors["danger"], alpha=0.3, interpolate=True)
+    ax.fill_between([d.strftime("%m/%d") for d in dates], remaining_data, ideal_remaining, 
+                   where=np.array(remaining_data) >= np.array(ideal_remaining), 
+                   color=colors["good"], alpha=0.3, interpolate=True)
+
+    # Add labels and title
+    ax.set_xlabel('Date')
+    ax.set_ylabel('Remaining Credits')
+    ax.set_title('Remaining Credits Over Time')
+
+    # Add legend
+    ax.legend()
+
+    # Rotate x-axis labels for better readability
+    if len(dates) > 10:
+        # Show fewer x-ticks for readability
+        step = max(1, len(dates) // 10)
+        ax.set_xticks([d.strftime("%m/%d") for d in dates[::step]])
+        ax.set_xticklabels([d.strftime("%m/%d") for d in dates[::step]], rotation=45, ha='right')
+    else:
+        ax.set_xticklabels([d.strftime("%m/%d") for d in dates], rotation=45, ha='right')
+
+    # Adjust layout
+    fig.tight_layout()
+
+
+def draw_usage_heatmap(fig, dates, usage_data, daily_target):
+    import numpy as np
+    from matplotlib import colormaps
+
+    if not dates:
+        # No data to display
+        draw_no_data(fig)
+        return
+
+    # One calendar matrix for the whole range: a row per weekday and a column per week starting on
+    # Monday, days outside the range stay NaN and are left blank
+    offset = dates[0].weekday()
+    weeks = (offset + len(dates) + 6) // 7
+    ratios = np.full(weeks * 7, np.nan)
+    ratios[offset:offset + len(dates)] = np.asarray(usage_data) / daily_target
+    grid = ratios.reshape(weeks, 7).T
+
+    # fixed margins instead of tight_layout, the axes don't depend on the data
+    ax = fig.add_axes([0.07, 0.18, 0.8, 0.72])
+    cbar_ax = fig.add_axes([0.9, 0.18, 0.02, 0.72])
+
+    cmap = colormaps["RdYlGn_r"].with_extremes(bad="white")  # Red for high usage, green for low
+    im = ax.imshow(grid, cmap=cmap, vmin=0, vmax=2, aspect="auto", interpolation="nearest")
+    cbar = fig.colorbar(im, cax=cbar_ax)
+    cbar.set_label('Usage Ratio (Actual/Target)')
+
+    ax.set_title(f"Daily Usage vs Target, {dates[0].strftime('%b %d, %Y')} - {dates[-1].strftime('%b %d, %Y')}")
+    ax.set_yticks(range(7))
+    ax.set_yticklabels(['M', 'T', 'W', 'T', 'F', 'S', 'S'])
+    for spine in ax.spines.values():
+        spine.set_visible(False)
+
+    # size of one day in pixels decides how much labelling fits
+    cell_width = fig.bbox.width * 0.8 / weeks
+    cell_height = fig.bbox.height * 0.72 / 7
+
+    # month names under the week each month starts in, thinned out so they don't overlap
+    days = np.arange(np.datetime64(dates[0], "D"), np.datetime64(dates[-1], "D") + 1)
+    months = days.astype("datetime64[M]")
+    starts = np.flatnonzero(np.r_[True, months[1:] != months[:-1]])
+    step = max(1, int(np.ceil(50 / (cell_width * 4.35))))
+    starts = starts[::step]
+    ax.set_xticks((offset + starts) // 7)
+    ax.set_xticklabels([dates[i].strftime("%b %Y") for i in starts], rotation=45, ha='right')
+
+    # day numbers only when the cells are big enough to read them, which also caps how many there are
+    if min(cell_width, cell_height) >= 16:
+        positions = np.arange(offset, offset + len(dates))
+        for position, date, ratio in zip(positions, dates, ratios[positions]):
+            week, weekday = divmod(position, 7)
+            ax.text(week, weekday, str(date.day), ha='center', va='center', fontsize=8,
+                    color='black' if ratio < 1.5 else 'white')
@@ -0,0 +1,274 @@
+# poe_index.py
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import date
+
+from poe_storage import date_str_to_ordinal, ordinal_to_date_str
+
+
+class DateIndex:
+    # sorted day ordinals of every usage entry, kept in step with data["daily_usage"]
+    def __init__(self, date_strs=()):
+        self.rebuild(date_strs)
+
+    def rebuild(self, date_strs):
+        self.ordinals = sorted(date_str_to_ordinal(d) for d in date_strs)
+
+    def __len__(self):
+        return len(self.ordinals)
+
+    def add(self, date_str):
+        ordinal = date_str_to_ordinal(date_str)
+        i = bisect_left(self.ordinals, ordinal)
+        if i == len(self.ordinals) or self.ordinals[i] != ordinal:
+            self.ordinals.insert(i, ordinal)
+
+    def remove(self, date_str):
+        ordinal = date_str_to_ordinal(date_str)
+        i = bisect_left(self.ordinals, ordinal)
+        if i < len(self.ordinals) and self.ordinals[i] == ordinal:
+            del self.ordinals[i]
+
+    def previous(self, date_str):
+        # latest entry strictly before date_str
+        i = bisect_left(self.ordinals, date_str_to_ordinal(date_str))
+        return ordinal_to_date_str(self.ordinals[i - 1]) if i > 0 else None
+
+    def next(self, date_str):
+        # earliest entry strictly after date_str
+        i = bisect_right(self.ordinals, date_str_to_ordinal(date_str))
+        return ordinal_to_date_str(self.ordinals[i]) if i < len(self.ordinals) else None
+
+    def bounds(self, start_date, end_date):
+        # slice [lo, hi) of self.ordinals covering the inclusive date range
+        lo = bisect_left(self.ordinals, start_date.toordinal())
+        hi = bisect_right(self.ordinals, end_date.toordinal())
+        return lo, hi
+
+    def between(self, start_date, end_date):
+        # inclusive range of entry dates as strings, oldest first
+        lo, hi = self.bounds(start_date, end_date)
+        return [ordinal_to_date_str(o) for o in self.ordinals[lo:hi]]
+
+    def first(self):
+        return ordinal_to_date_str(self.ordinals[0]) if self.ordinals else None
+
+    def last(self):
+        return ordinal_to_date_str(self.ordinals[-1]) if self.ordinals else None
+
+
+class TextIndex:
+    # every 1-3 character gram of each lowercased text, mapped to the keys containing it;
+    # substring search intersects gram sets and only verifies the few candidates left
+    gram_size = 3
+
+    def __init__(self, texts=None):
+        self.texts = {}
+        self.grams = defaultdict(set)
+        for key, text in (texts or {}).items():
+            self.set(key, text)
+
+    def grams_of(self, text):
+        return {text[i:i + n] for n in range(1, self.gram_size + 1) for i in range(len(text) - n + 1)}
+
+    def set(self, key, text):
+        text = text.lower()
+        if self.texts.get(key) == text:
+            return
+        self.remove(key)
+        if not text:
+            return
+        self.texts[key] = text
+        for gram in self.grams_of(text):
+            self.grams[gram].add(key)
+
+    def remove(self, key):
+        text = self.texts.pop(key, None)
+        if text is None:
+            return
+        for gram in self.grams_of(text):
+            keys = self.grams[gram]
+            keys.discard(key)
+            if not keys:
+                del self.grams[gram]
+
+    def search(self, query):
+        # keys whose text contains query, case-insensitive
+        query = query.lower()
+        if not query:
+            return set(self.texts)
+        if len(query) <= self.gram_size:
+            # short queries are grams themselves, no verification needed
+            return set(self.grams.get(query, ()))
+
+        candidates = None
+        for gram in sorted((query[i:i + self.gram_size] for i in range(len(query) - self.gram_size + 1)),
+                           key=lambda g: len(self.grams.get(g, ()))):
+            keys = self.grams.get(gram)
+            if not keys:
+                return set()
+            candidates = set(keys) if candidates is None else candidates & keys
+        return {key for key in candidates if query in self.texts[key]}
+
+
+def derive_used(data, date_index, date_str):
+    # usage for a day is the drop from the previous entry, or from the full allowance for the first one
+    prev_date = date_index.previous(date_str)
+    if prev_date:
+        base = data["daily_usage"][prev_date]["remaining"]
+    else:
+        base = data["total_credits"]
+    return base - data["daily_usage"][date_str]["remaining"]
+
+
+def recompute_used(data, date_index, date_strs):
+    # refresh "used" for the given dates and for the entry after each of them, which is measured
+    # from it; returns the dates whose stored value changed
+    affected = set()
+    for date_str in date_strs:
+        if date_str in data["daily_usage"]:
+            affected.add(date_str)
+        next_date = date_index.next(date_str)
+        if next_date:
+            affected.add(next_date)
+
+    changed = []
+    for date_str in sorted(affected):
+        entry = data["daily_usage"][date_str]
+        used = derive_used(data, date_index, date_str)
+        if entry.get("used") != used:
+            entry["used"] = used
+            changed.append(date_str)
+    return changed
+
+
+def rebuild_used(data, date_index):
+    # single pass over every entry in date order, for bulk changes like imports
+    changed = []
+    base = data["total_credits"]
+    for ordinal in date_index.ordinals:
+        date_str = ordinal_to_date_str(ordinal)
+        entry = data["daily_usage"][date_str]
+        used = base - entry["remaining"]
+        if entry.get("used") != used:
+            entry["used"] = used
+            changed.append(date_str)
+        base = entry["remaining"]
+    return changed
+
+
+class FenwickTree:
+    # prefix sums with O(log n) point updates
+    def __init__(self, values):
+        # linear-time build from a plain list
+        self.size = len(values)
+        self.tree = [0] + list(values)
+        for i in range(1, self.size + 1):
+            parent = i + (i & -i)
+            if parent <= self.size:
+                self.tree[parent] += self.tree[i]
+
+    def add(self, i, delta):
+        i += 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix(self, i):
+        # sum of positions [0, i)
+        total = 0
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def range_sum(self, lo, hi):
+        # sum of positions [lo, hi)
+        return self.prefix(hi) - self.prefix(lo)
+
+
+class UsageAggregates:
+    # per-day usage folded into Fenwick trees keyed by day ordinal, so any date range
+    # answers totals and over/under target counts in logarithmic time
+    slack = 366
+
+    def __init__(self, data, date_index, daily_target):
+        self.daily_target = daily_target
+        self.used = {o: data["daily_usage"][ordinal_to_date_str(o)].get("used", 0) or 0
+                     for o in date_index.ordinals}
+        self.build()
+
+    def build(self):
+        # cover every known day plus some room on both sides so new entries rarely force a rebuild
+        ordinals = list(self.used)
+        if ordinals:
+            self.base = min(ordinals) - self.slack
+            size = max(ordinals) - self.base + 1 + self.slack
+        else:
+            self.base = date.today().toordinal() - self.slack
+            size = 2 * self.slack
+
+        totals = [0] * size
+        entries = [0] * size
+        active = [0] * size
+        over = [0] * size
+        for ordinal, used in self.used.items():
+            i = ordinal - self.base
+            totals[i] = used
+            entries[i] = 1
+            active[i] = 1 if used > 0 else 0
+            over[i] = 1 if used > self.daily_target else 0
+
+        self.totals = FenwickTree(totals)
+        self.entries = FenwickTree(entries)
+        self.active = FenwickTree(active)
+        self.over = FenwickTree(over)
+
+    def set_target(self, daily_target):
+        # the over-target tree depends on the target, everything else is unchanged
+        if daily_target != self.daily_target:
+            self.daily_target = daily_target
+            self.build()
+
+    def set(self, date_str, used):
+        ordinal = date_str_to_ordinal(date_str)
+        used = used or 0
+        if not self.base <= ordinal < self.base + self.totals.size:
+            self.used[ordinal] = used
+            self.build()
+            return
+
+        i = ordinal - self.base
+        old = self.used.get(ordinal)
+        if old is None:
+            self.entries.add(i, 1)
+            old = 0
+        self.used[ordinal] = used
+        self.totals.add(i, used - old)
+        self.active.add(i, (used > 0) - (old > 0))
+        self.over.add(i, (used > self.daily_target) - (old > self.daily_target))
+
+    def remove(self, date_str):
+        ordinal = date_str_to_ordinal(date_str)
+        old = self.used.pop(ordinal, None)
+        if old is None:
+            return
+        i = ordinal - self.base
+        self.entries.add(i, -1)
+        self.totals.add(i, -old)
+        self.active.add(i, -(old > 0))
+        self.over.add(i, -(old > self.daily_target))
+
+    def range(self, start_date, end_date):
+        # inclusive date range -> (total used, entries, days with usage, days over, days under)
+        lo = min(max(start_date.toordinal() - self.base, 0), self.totals.size)
+        hi = min(max(end_date.toordinal() - self.base + 1, 0), self.totals.size)
+        if lo >= hi:
+            return 0, 0, 0, 0, 0
+
+        total = self.totals.range_sum(lo, hi)
+        entries = self.entries.range_sum(lo, hi)
+        active = self.active.range_sum(lo, hi)
+        over = self.over.range_sum(lo, hi)
+        # with a non-negative target every over-target day also counts as a day with usage
+        return total, entries, active, over, active - over
@@ -0,0 +1,77 @@
+# poe_periods.py
+import calendar
+from datetime import date
+
+
+def reset_date(year, month, reset_day):
+    # months shorter than the reset day reset on their last day
+    return date(year, month, min(reset_day, calendar.monthrange(year, month)[1]))
+
+
+def shift_month(year, month, delta):
+    index = year * 12 + (month - 1) + delta
+    return index // 12, index % 12 + 1
+
+
+def period_bounds(day, reset_day):
+    # (start, end) of the period containing day; a period starts on a reset and ends at the next one
+    this_reset = reset_date(day.year, day.month, reset_day)
+    if day >= this_reset:
+        return this_reset, reset_date(*shift_month(day.year, day.month, 1), reset_day)
+    return reset_date(*shift_month(day.year, day.month, -1), reset_day), this_reset
+
+
+class BillingPeriod:
+    # one reset-to-reset window, end is the next reset and not part of the period
+    def __init__(self, start, end, total_credits):
+        self.start = start
+        self.end = end
+        self.length = (end - start).days
+        self.total_credits = total_credits
+
+        # the target spreads the allowance over the days of the month the period resets in
+        self.daily_target = total_credits / calendar.monthrange(end.year, end.month)[1]
+        self.ideal_curve = None
+
+    def __contains__(self, day):
+        return self.start <= day < self.end
+
+    def ideal_usage(self, day):
+        # how much should have been used by this day at an even pace
+        return (self.total_credits / self.length) * (day - self.start).days
+
+    def ideal_usage_curve(self):
+        # ideal cumulative usage for every day of the period, built once
+        if self.ideal_curve is None:
+            per_day = self.total_credits / self.length
+            self.ideal_curve = [per_day * i for i in range(self.length)]
+        return self.ideal_curve
+
+
+class PeriodTable:
+    # every billing period that has been asked for, keyed by start date; settings changes drop it
+    def __init__(self, total_credits, reset_day):
+        self.total_credits = total_credits
+        self.reset_day = reset_day
+        self.periods = {}
+
+    def period_for(self, day):
+        start, end = period_bounds(day, self.reset_day)
+        period = self.periods.get(start)
+        if period is None:
+            period = self.periods[start] = BillingPeriod(start, end, self.total_credits)
+        return period
+
+    def ending_on(self, end):
+        # the period that resets on the given date
+        return self.period_for(date.fromordinal(end.toordinal() - 1))
+
+    def between(self, start_date, end_date):
+        # periods overlapping the inclusive date range, oldest first
+        periods = []
+        day = start_date
+        while day <= end_date:
+            period = self.period_for(day)
+            periods.append(period)
+            day = period.end
+        return periods
@@ -0,0 +1,178 @@
+# poe_query.py
+import re
+import shlex
+from datetime import date
+from functools import lru_cache
+
+import numpy as np
+
+# filter syntax for the history view, terms are ANDed and a leading "-" negates one:
+#   used>40000  remaining<=100,000  date>=2025-01-01  date:2025-03  weekday:sat,sun
+#   status:over  note:"gpt 4"  -note:test  plain words match the date or note
+
+TERM = re.compile(r"^([a-z]+)(>=|<=|!=|:|=|>|<)(.+)$", re.IGNORECASE)
+FIELDS = ("used", "remaining", "date", "weekday", "status", "note")
+
+COMPARISONS = {
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+    "=": np.equal,
+    ":": np.equal,
+    "!=": np.not_equal,
+}
+
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+# status codes, matching the history view's labels
+ON_TRACK, WARNING, OVER_BUDGET = 0, 1, 2
+STATUSES = {"ok": ON_TRACK, "track": ON_TRACK, "ontrack": ON_TRACK, "on": ON_TRACK,
+            "warning": WARNING, "warn": WARNING,
+            "over": OVER_BUDGET, "overbudget": OVER_BUDGET}
+
+
+class QueryError(ValueError):
+    pass
+
+
+class Query:
+    # a parsed filter, each term maps (columns, daily_target, search) to a boolean mask
+    def __init__(self, text, terms):
+        self.text = text
+        self.terms = terms
+
+    def mask(self, columns, daily_target, search):
+        # columns are parallel arrays of entry ordinals, remaining and used; search(text, notes_only)
+        # returns the matching date strings
+        mask = np.ones(len(columns.ordinals), dtype=bool)
+        for term in self.terms:
+            mask &= term(columns, daily_target, search)
+        return mask
+
+
+def status_codes(used, daily_target):
+    return np.where(used > daily_target * 1.2, OVER_BUDGET, np.where(used > daily_target, WARNING, ON_TRACK))
+
+
+def weekdays(ordinals):
+    # date.fromordinal(1) is a Monday
+    return (ordinals - 1) % 7
+
+
+def parse_number(value):
+    try:
+        return float(value.replace(",", ""))
+    except ValueError:
+        raise QueryError(f"Not a number: {value}")
+
+
+def parse_date_range(value):
+    # YYYY, YYYY-MM or YYYY-MM-DD -> inclusive (first, last) ordinals
+    parts = value.split("-")
+    try:
+        numbers = [int(p) for p in parts]
+        if len(numbers) == 1:
+            return date(numbers[0], 1, 1).toordinal(), date(numbers[0], 12, 31).toordinal()
+        if len(numbers) == 2:
+            year, month = numbers
+            first = date(year, month, 1)
+            last = date(year + month // 12, month % 12 + 1, 1)
+            return first.toordinal(), last.toordinal() - 1
+        if len(numbers) == 3:
+            ordinal = date(*numbers).toordinal()
+            return ordinal, ordinal
+    except ValueError:
+        pass
+    raise QueryError(f"Not a date: {value}")
+
+
+def parse_choices(value, names):
+    # comma separated names or unambiguous prefixes of them
+    codes = set()
+    for choice in value.lower().split(","):
+        matches = {code for name, code in names if name.startswith(choice)} if choice else set()
+        if len(matches) != 1:
+            raise QueryError(f"Unknown value: {choice}")
+        codes |= matches
+    return sorted(codes)
+
+
+def matching(text, notes_only):
+    # a term that keeps entries whose date (or only note) contains text
+    def term(columns, daily_target, search_dates):
+        matches = search_dates(text, notes_only)
+        ordinals = np.fromiter((date.fromisoformat(d).toordinal() for d in matches), dtype=np.int64,
+                               count=len(matches))
+        return np.isin(columns.ordinals, ordinals)
+    return term
+
+
+def compile_term(token):
+    negate = token.startswith("-") and len(token) > 1
+    if negate:
+        token = token[1:]
+
+    # anything that isn't a known field, like "re:gpt" or a URL, is searched for as typed
+    match = TERM.match(token)
+    if not match or match.group(1).lower() not in FIELDS:
+        term = matching(token, notes_only=False)
+    else:
+        field, op, value = match.group(1).lower(), match.group(2), match.group(3)
+        term = compile_field(field, op, value)
+
+    if negate:
+        return lambda columns, daily_target, search: ~term(columns, daily_target, search)
+    return term
+
+
+def compile_field(field, op, value):
+    if field in ("used", "remaining"):
+        number = parse_number(value)
+        compare = COMPARISONS[op]
+        return lambda columns, daily_target, search: compare(getattr(columns, field), number)
+
+    if field == "date":
+        first, last = parse_date_range(value)
+        if op in (":", "="):
+            return lambda columns, daily_target, search: (columns.ordinals >= first) & (columns.ordinals <= last)
+        if op == "!=":
+            return lambda columns, daily_target, search: (columns.ordinals < first) | (columns.ordinals > last)
+        # comparisons against a partial date use its whole span: date>2025-03 starts in April
+        bound = last if op in (">", "<=") else first
+        compare = COMPARISONS[op]
+        return lambda columns, daily_target, search: compare(columns.ordinals, bound)
+
+    if field in ("weekday", "status"):
+        if op not in (":", "=", "!="):
+            raise QueryError(f"{field} only supports : and !=")
+        if field == "weekday":
+            codes = parse_choices(value, [(name, i) for i, name in enumerate(WEEKDAYS)])
+            values = lambda columns, daily_target: weekdays(columns.ordinals)
+        else:
+            codes = parse_choices(value, STATUSES.items())
+            values = lambda columns, daily_target: status_codes(columns.used, daily_target)
+        if op == "!=":
+            return lambda columns, daily_target, search: ~np.isin(values(columns, daily_target), codes)
+        return lambda columns, daily_target, search: np.isin(values(columns, daily_target), codes)
+
+    if field == "note":
+        if op not in (":", "=", "!="):
+            raise QueryError("note only supports : and !=")
+        term = matching(value, notes_only=True)
+        if op == "!=":
+            return lambda columns, daily_target, search: ~term(columns, daily_target, search)
+        return term
+
+    raise QueryError(f"Unknown field: {field}")
+
+
+@lru_cache(maxsize=32)
+def compile_query(text):
+    # parse once; the same text typed again reuses the compiled query. Quotes group words, an
+    # unbalanced one (as in "don't") just splits on whitespace instead
+    try:
+        tokens = shlex.split(text)
+    except ValueError:
+        tokens = text.split()
+    return Query(text, [compile_term(token) for token in tokens])
@@ -0,0 +1,234 @@
+# poe_storage.py
+import json
+import os
+import sqlite3
+from datetime import date
+
+
+def apply_change(data, change):
+    # change is ("set", path, value) or ("del", path) where path is a tuple of keys
+    op, path = change[0], change[1]
+    target = data
+    for key in path[:-1]:
+        target = target.setdefault(key, {})
+
+    if op == "set":
+        target[path[-1]] = change[2]
+    elif op == "del":
+        target.pop(path[-1], None)
+    else:
+        raise ValueError(f"Unknown change operation: {op}")
+
+
+def write_snapshot(file_path, data):
+    # write to a temp file first so a crash never leaves a half-written data file
+    temp_path = file_path + ".tmp"
+    with open(temp_path, 'w') as f:
+        json.dump(data, f, indent=4)
+    os.replace(temp_path, file_path)
+
+
+class JsonStorage:
+    # original behaviour: every save rewrites the whole data file
+    name = "json"
+
+    def __init__(self, data_file):
+        self.data_file = data_file
+
+    def load(self):
+        if not os.path.exists(self.data_file):
+            return None
+        with open(self.data_file, 'r') as f:
+            return json.load(f)
+
+    def save(self, data):
+        write_snapshot(self.data_file, data)
+
+    def append(self, data, changes):
+        self.save(data)
+
+    def close(self, data):
+        pass
+
+    def discard_journal(self):
+        pass
+
+
+class JournalStorage(JsonStorage):
+    # snapshot + append-only journal, each edit costs one small line instead of a full rewrite
+    name = "journal"
+
+    def __init__(self, data_file, compact_every=200):
+        super().__init__(data_file)
+        self.journal_file = data_file + ".journal"
+        self.compact_every = compact_every
+        self.journal_length = 0
+
+    def load(self):
+        data = super().load()
+        if data is None:
+            # a journal without a snapshot has nothing to replay onto
+            self.discard_journal()
+            return None
+
+        self.journal_length = 0
+        torn = False
+        if os.path.exists(self.journal_file):
+            with open(self.journal_file, 'r') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        op, path, *value = json.loads(line)
+                    except (json.JSONDecodeError, ValueError):
+                        # torn last write from a crash, everything before it is still good
+                        torn = True
+                        break
+                    apply_change(data, (op, tuple(path), *value))
+                    self.journal_length += 1
+
+        if torn:
+            # compact right away, appending after the fragment would put new edits on the broken line
+            self.save(data)
+        return data
+
+    def save(self, data):
+        # compaction: fold the journal into a fresh snapshot
+        super().save(data)
+        self.discard_journal()
+
+    def append(self, data, changes):
+        with open(self.journal_file, 'a') as f:
+            for change in changes:
+                f.write(json.dumps([change[0], list(change[1]), *change[2:]], separators=(',', ':')) + "\n")
+        self.journal_length += len(changes)
+
+        if self.journal_length >= self.compact_every:
+            self.save(data)
+
+    def close(self, data):
+        if self.journal_length:
+            self.save(data)
+
+    def discard_journal(self):
+        if os.path.exists(self.journal_file):
+            os.remove(self.journal_file)
+        self.journal_length = 0
+
+
+class SqliteStorage:
+    # usage and notes live in indexed tables keyed by day ordinal, settings in a key/value table
+    name = "sqlite"
+
+    def __init__(self, db_file):
+        self.db_file = db_file
+        self.conn = None
+
+    def connect(self):
+        if self.conn is None:
+            self.conn = sqlite3.connect(self.db_file)
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+                CREATE TABLE IF NOT EXISTS usage (date INTEGER PRIMARY KEY, remaining INTEGER NOT NULL,
+                                                  used INTEGER NOT NULL);
+                CREATE TABLE IF NOT EXISTS notes (date INTEGER PRIMARY KEY, note TEXT NOT NULL);
+            """)
+        return self.conn
+
+    def load(self):
+        if not os.path.exists(self.db_file):
+            return None
+        conn = self.connect()
+
+        data = {key: json.loads(value) for key, value in conn.execute("SELECT key, value FROM meta")}
+        if not data:
+            return None
+
+        data["daily_usage"] = {}
+        for ordinal, remaining, used in conn.execute("SELECT date, remaining, used FROM usage ORDER BY date"):
+            date_str = ordinal_to_date_str(ordinal)
+            data["daily_usage"][date_str] = {"remaining": remaining, "used": used, "date": date_str}
+
+        data["notes"] = {ordinal_to_date_str(ordinal): note
+                         for ordinal, note in conn.execute("SELECT date, note FROM notes ORDER BY date")}
+        return data
+
+    def save(self, data):
+        conn = self.connect()
+        with conn:
+            conn.execute("DELETE FROM meta")
+            conn.execute("DELETE FROM usage")
+            conn.execute("DELETE FROM notes")
+            conn.executemany("INSERT INTO meta (key, value) VALUES (?, ?)",
+                             [(key, json.dumps(value)) for key, value in data.items()
+                              if key not in ("daily_usage", "notes")])
+            conn.executemany("INSERT INTO usage (date, remaining, used) VALUES (?, ?, ?)",
+                             [(date_str_to_ordinal(date_str), entry["remaining"], entry.get("used", 0))
+                              for date_str, entry in data.get("daily_usage", {}).items()])
+            conn.executemany("INSERT INTO notes (date, note) VALUES (?, ?)",
+                             [(date_str_to_ordinal(date_str), note)
+                              for date_str, note in data.get("notes", {}).items()])
+
+    def append(self, data, changes):
+        conn = self.connect()
+        with conn:
+            for change in changes:
+                op, path = change[0], change[1]
+                if path[0] == "daily_usage":
+                    if op == "set":
+                        entry = change[2]
+                        conn.execute("INSERT OR REPLACE INTO usage (date, remaining, used) VALUES (?, ?, ?)",
+                                     (date_str_to_ordinal(path[1]), entry["remaining"], entry.get("used", 0)))
+                    else:
+                        conn.execute("DELETE FROM usage WHERE date = ?", (date_str_to_ordinal(path[1]),))
+                elif path[0] == "notes":
+                    if op == "set":
+                        conn.execute("INSERT OR REPLACE INTO notes (date, note) VALUES (?, ?)",
+                                     (date_str_to_ordinal(path[1]), change[2]))
+                    else:
+                        conn.execute("DELETE FROM notes WHERE date = ?", (date_str_to_ordinal(path[1]),))
+                elif op == "set":
+                    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                                 (path[0], json.dumps(change[2])))
+                else:
+                    conn.execute("DELETE FROM meta WHERE key = ?", (path[0],))
+
+    def close(self, data):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def discard_journal(self):
+        pass
+
+    def remove(self):
+        self.close(None)
+        if os.path.exists(self.db_file):
+            os.remove(self.db_file)
+
+    def set_aside(self):
+        # keep an unreadable database around for inspection instead of deleting it
+        self.close(None)
+        os.replace(self.db_file, self.db_file + ".corrupt")
+
+
+def date_str_to_ordinal(date_str):
+    return date.fromisoformat(date_str).toordinal()
+
+
+def ordinal_to_date_str(ordinal):
+    return date.fromordinal(ordinal).isoformat()
+
+
+def open_storage(data_file, backend=None):
+    # without an explicit backend, an existing SQLite database wins over the JSON file
+    db_file = os.path.splitext(data_file)[0] + ".db"
+    if backend is None:
+        backend = "sqlite" if os.path.exists(db_file) else "journal"
+
+    if backend == "sqlite":
+        return SqliteStorage(db_file)
+    if backend == "json":
+        return JsonStorage(data_file)
+    return JournalStorage(data_file)
@@ -0,0 +1,495 @@
+# poe_store.py
+import json
+import sqlite3
+import warnings
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import datetime
+
+from poe_index import DateIndex, TextIndex, UsageAggregates, rebuild_used, recompute_used
+from poe_periods import PeriodTable, reset_date, shift_month
+from poe_storage import open_storage, ordinal_to_date_str
+
+RangeStats = namedtuple("RangeStats", ["total_used", "entries", "active_days", "days_over", "days_under"])
+UsageSeries = namedtuple("UsageSeries", ["dates", "used", "remaining"])
+UsageColumns = namedtuple("UsageColumns", ["ordinals", "remaining", "used"])
+
+SETTINGS_DEFAULTS = {
+    "theme": "light",
+    "show_projections": True,
+    "notifications": True,
+    "low_credit_threshold": 20,  # percentage
+}
+
+
+def next_reset_after(today, reset_day):
+    # the reset on or after today
+    this_reset = reset_date(today.year, today.month, reset_day)
+    if today <= this_reset:
+        return this_reset
+    return reset_date(*shift_month(today.year, today.month, 1), reset_day)
+
+
+def canonical_date(date_str):
+    # YYYY-MM-DD for anything strptime accepts (older versions stored "2024-1-5" as typed),
+    # ValueError otherwise
+    return datetime.strptime(date_str, "%Y-%m-%d").date().isoformat()
+
+
+def normalize_dates(data):
+    # rewrite legacy date keys of usage entries and notes in place, dropping ones that aren't dates;
+    # returns whether anything changed
+    changed = False
+    for section in ("daily_usage", "notes"):
+        entries = data[section]
+        for date_str in list(entries):
+            try:
+                key = canonical_date(date_str)
+            except ValueError:
+                warnings.warn(f"Skipping {section} entry with invalid date {date_str!r}")
+                del entries[date_str]
+                changed = True
+                continue
+            if key != date_str:
+                value = entries.pop(date_str)
+                # an entry already stored under the canonical key wins
+                entries.setdefault(key, value)
+                changed = True
+
+    for date_str, entry in data["daily_usage"].items():
+        if entry.get("date") != date_str:
+            entry["date"] = date_str
+            changed = True
+    return changed
+
+
+def complete_data(data):
+    # fill in missing fields and normalize dates of loaded or restored data; returns whether anything changed
+    for key, value in SETTINGS_DEFAULTS.items():
+        data.setdefault(key, value)
+    data.setdefault("daily_usage", {})
+    data.setdefault("notes", {})
+    return normalize_dates(data)
+
+
+class UsageStore:
+    # all usage data and the math on it, with no Tk dependency; the GUI is one consumer
+    def __init__(self, data_file, backend=None):
+        self.data_file = data_file
+        self.storage = open_storage(data_file, backend)
+        self.pending_changes = None
+        self.on_save = None
+        # bumped on every change, views compare it to what they last rendered
+        self.version = 0
+        self.load()
+
+    # ---- persistence ----
+
+    def load(self):
+        try:
+            data = self.storage.load()
+        except json.JSONDecodeError:
+            data = None
+        except sqlite3.DatabaseError:
+            # not a usable database, move it aside and fall back to the JSON file
+            self.storage.set_aside()
+            self.storage = open_storage(self.data_file, "journal")
+            return self.load()
+
+        if data is None:
+            self.data = self.default_data(1000000, 29, dict(SETTINGS_DEFAULTS))
+            self.reindex()
+            self.save()
+            return
+
+        normalized = complete_data(data)
+
+        self.data = data
+        self.reindex()
+        if normalized:
+            self.save()
+
+    def default_data(self, total_credits, reset_day, settings):
+        today = datetime.now()
+        data = {
+            "total_credits": total_credits,
+            "remaining_credits": total_credits,
+            "reset_day": reset_day,
+            "next_reset": next_reset_after(today.date(), reset_day).strftime("%Y-%m-%d"),
+            "daily_usage": {},
+            "last_updated": today.strftime("%Y-%m-%d"),
+            "notes": {}  # store notes for specific dates
+        }
+        data.update(settings)
+        return data
+
+    def reindex(self):
+        self.version += 1
+        self.reset_periods()
+        self.date_index = DateIndex(self.data["daily_usage"])
+        self.aggregates = UsageAggregates(self.data, self.date_index, self.daily_target())
+        # the text index is built on the first search
+        self.search_index = None
+        self.columns = None
+
+    def save(self, changes=None):
+        # with a list of changes only those get journaled, otherwise write a full snapshot
+        self.version += 1
+        if self.pending_changes is not None and changes is not None:
+            self.pending_changes.extend(changes)
+            return
+
+        if changes is None:
+            self.storage.save(self.data)
+        else:
+            self.storage.append(self.data, changes)
+
+        if self.on_save:
+            self.on_save()
+
+    @contextmanager
+    def batch(self):
+        # group several mutations into one journal write, for scripts and other non-GUI callers:
+        #     with store.batch():
+        #         store.record_usage(...); store.set_note(...)
+        if self.pending_changes is not None:
+            yield
+            return
+
+        self.pending_changes = []
+        try:
+            yield
+        finally:
+            changes, self.pending_changes = self.pending_changes, None
+            if changes:
+                self.save(changes)
+
+    def switch_storage(self, backend):
+        if backend == self.storage.name:
+            return
+
+        # migrate the in-memory data into the new backend before letting go of the old one
+        new_storage = open_storage(self.data_file, backend)
+        new_storage.save(self.data)
+
+        old_storage = self.storage
+        self.storage = new_storage
+        old_storage.close(self.data)
+        if old_storage.name == "sqlite":
+            # the JSON file is authoritative again, drop the database so it isn't picked up on launch
+            old_storage.remove()
+
+    def close(self):
+        self.storage.close(self.data)
+
+    # ---- mutations ----
+
+    def put_entry(self, date_str, remaining):
+        # "used" is derived below (None so the entry always counts as changed)
+        self.date_index.add(date_str)
+        self.index_search_text(date_str)
+        self.data["daily_usage"][date_str] = {
+            "remaining": remaining,
+            "used": None,
+            "date": date_str
+        }
+
+        # derive usage for this day and the next entry, which is measured from this one
+        return self.recompute_used([date_str])
+
+    def recompute_used(self, date_strs):
+        # re-derive affected "used" values and return them as journal changes
+        changed = recompute_used(self.data, self.date_index, date_strs)
+        for d in changed:
+            self.aggregates.set(d, self.data["daily_usage"][d]["used"])
+        return [("set", ("daily_usage", d), self.data["daily_usage"][d]) for d in changed]
+
+    def record_usage(self, date_str, remaining, note=""):
+        # a reading from the dashboard also becomes the current balance
+        date_str = canonical_date(date_str)
+
+        changes = self.put_entry(date_str, remaining)
+        self.data["remaining_credits"] = remaining
+        self.data["last_updated"] = date_str
+        changes += [
+            ("set", ("remaining_credits",), remaining),
+            ("set", ("last_updated",), date_str)
+        ]
+
+        if note:
+            self.data["notes"][date_str] = note
+            self.index_search_text(date_str)
+            changes.append(("set", ("notes", date_str), note))
+
+        self.save(changes)
+
+    def edit_usage(self, date_str, remaining):
+        changes = self.put_entry(date_str, remaining)
+
+        # only the most recent entry sets the current balance
+        if self.date_index.last() == date_str:
+            self.data["remaining_credits"] = remaining
+            changes.append(("set", ("remaining_credits",), remaining))
+
+        self.save(changes)
+
+    def delete_usage(self, date_str):
+        if date_str not in self.data["daily_usage"]:
+            return False
+
+        del self.data["daily_usage"][date_str]
+        self.date_index.remove(date_str)
+        self.aggregates.remove(date_str)
+
+        # the balance falls back to the latest remaining entry
+        latest_date = self.date_index.last()
+        if latest_date:
+            self.data["remaining_credits"] = self.data["daily_usage"][latest_date]["remaining"]
+        else:
+            self.data["remaining_credits"] = self.data["total_credits"]
+
+        self.save([
+            ("del", ("daily_usage", date_str)),
+            ("set", ("remaining_credits",), self.data["remaining_credits"])
+        ] + self.recompute_used([date_str]))
+        return True
+
+    def set_note(self, date_str, note):
+        # an empty note removes it
+        if note:
+            self.data["notes"][date_str] = note
+            self.index_search_text(date_str)
+            self.save([("set", ("notes", date_str), note)])
+        elif date_str in self.data["notes"]:
+            del self.data["notes"][date_str]
+            self.index_search_text(date_str)
+            self.save([("del", ("notes", date_str))])
+
+    def update_settings(self, **settings):
+        self.data.update(settings)
+        self.data["next_reset"] = next_reset_after(datetime.now().date(), self.data["reset_day"]).strftime("%Y-%m-%d")
+        self.reset_periods()
+
+        changes = [("set", (key,), self.data[key]) for key in list(settings) + ["next_reset"]]
+
+        # over-target counts follow the new daily target
+        self.aggregates.set_target(self.daily_target())
+
+        # the first entry's usage is measured from the total
+        if self.date_index.first():
+            changes += self.recompute_used([self.date_index.first()])
+
+        self.save(changes)
+
+    def reset(self):
+        # keep settings but drop usage data
+        settings = {key: self.data.get(key, value) for key, value in SETTINGS_DEFAULTS.items()}
+        self.data = self.default_data(self.data["total_credits"], self.data["reset_day"], settings)
+        self.reindex()
+        self.save()
+
+    def restore(self, backup_data):
+        # backups may predate the current format, the SQLite backend needs canonical date keys
+        complete_data(backup_data)
+        self.storage.save(backup_data)
+        self.load()
+
+    def import_rows(self, rows):
+        # rows of (date, remaining, used[, note]) strings, bad rows are skipped
+        imported = 0
+        for row in rows:
+            if len(row) < 3:
+                continue
+            try:
+                date_str = canonical_date(row[0])
+                remaining = int(row[1])
+                used = int(row[2])
+            except ValueError:
+                continue
+            self.date_index.add(date_str)
+
+            self.data["daily_usage"][date_str] = {
+                "remaining": remaining,
+                "used": used,
+                "date": date_str
+            }
+            if len(row) >= 4 and row[3]:
+                self.data["notes"][date_str] = row[3]
+            self.index_search_text(date_str)
+
+            # update remaining credits if this is the latest entry
+            if self.date_index.last() == date_str:
+                self.data["remaining_credits"] = remaining
+            imported += 1
+
+        # imported rows can sit between existing ones, re-derive usage in one pass
+        rebuild_used(self.data, self.date_index)
+        self.aggregates = UsageAggregates(self.data, self.date_index, self.daily_target())
+        self.save()
+        return imported
+
+    # ---- queries ----
+
+    def used_on(self, date_str):
+        entry = self.data["daily_usage"].get(date_str)
+        return entry.get("used", 0) if entry else 0
+
+    def note(self, date_str):
+        return self.data["notes"].get(date_str, "")
+
+    def search_text(self, date_str):
+        # what history search matches against; the newline keeps queries from spanning date and note
+        return f"{date_str}\n{self.note(date_str)}"
+
+    def index_search_text(self, date_str):
+        if self.search_index is not None:
+            self.search_index.set(date_str, self.search_text(date_str))
+
+    def search_dates(self, query, notes_only=False):
+        # dates whose date string or note contains query, case-insensitive
+        if self.search_index is None:
+            self.search_index = TextIndex({d: self.search_text(d)
+                                           for d in set(self.data["daily_usage"]) | set(self.data["notes"])})
+        matches = self.search_index.search(query)
+        if notes_only:
+            query = query.lower()
+            matches = {d for d in matches if query in self.note(d).lower()}
+        return matches
+
+    def usage_columns(self):
+        # every entry as parallel arrays, oldest first; rebuilt on the first use after a change.
+        # numpy is only imported by the methods that need it so loading the store stays cheap
+        import numpy as np
+        
+        if self.columns is None or self.columns[0] != self.version:
+            ordinals = self.date_index.ordinals
+            entries = [self.data["daily_usage"][ordinal_to_date_str(o)] for o in ordinals]
+            columns = UsageColumns(
+                np.array(ordinals, dtype=np.int64),
+                np.array([entry["remaining"] for entry in entries], dtype=np.int64),
+                np.array([entry.get("used") or 0 for entry in entries], dtype=np.int64),
+            )
+            self.columns = (self.version, columns)
+        return self.columns[1]
+
+    def usage_ratios(self, start_date, end_date):
+        # usage over the daily target for every day of the inclusive range, NaN where there is no entry
+        import numpy as np
+        
+        lo, hi = self.date_index.bounds(start_date, end_date)
+        columns = self.usage_columns()
+        ratios = np.full(end_date.toordinal() - start_date.toordinal() + 1, np.nan)
+        ratios[columns.ordinals[lo:hi] - start_date.toordinal()] = columns.used[lo:hi] / self.daily_target()
+        return ratios
+
+    def query_dates(self, start_date, end_date, query, newest_first=False):
+        # entry dates in the inclusive range that match a compiled poe_query.Query
+        lo, hi = self.date_index.bounds(start_date, end_date)
+        columns = UsageColumns(*(column[lo:hi] for column in self.usage_columns()))
+        ordinals = columns.ordinals[query.mask(columns, self.daily_target(), self.search_dates)]
+        if newest_first:
+            ordinals = ordinals[::-1]
+        return [ordinal_to_date_str(o) for o in ordinals.tolist()]
+
+    def dates_between(self, start_date, end_date, newest_first=False):
+        dates = self.date_index.between(start_date, end_date)
+        return dates[::-1] if newest_first else dates
+
+    def sort_dates(self, date_strs, field, descending=False):
+        # order entry dates by a typed field: "date", "remaining" or "used";
+        # the sort is stable and ties stay newest first in either direction
+        ordered = sorted(date_strs, reverse=True)
+        if field == "date":
+            return ordered if descending else ordered[::-1]
+
+        usage = self.data["daily_usage"]
+        sort_keys = {
+            "remaining": lambda d: usage[d]["remaining"],
+            "used": lambda d: usage[d].get("used") or 0,
+        }
+        ordered.sort(key=sort_keys[field], reverse=descending)
+        return ordered
+
+    def earliest_date(self):
+        first = self.date_index.first()
+        return datetime.strptime(first, "%Y-%m-%d").date() if first else None
+
+    def export_rows(self):
+        # (date, remaining, used, note) for every entry, oldest first
+        for ordinal_date in self.date_index.between(datetime.min.date(), datetime.max.date()):
+            entry = self.data["daily_usage"][ordinal_date]
+            yield ordinal_date, entry["remaining"], entry.get("used", 0), self.note(ordinal_date)
+
+    def stats(self, start_date, end_date):
+        return RangeStats(*self.aggregates.range(start_date, end_date))
+
+    # ---- billing periods ----
+
+    def reset_periods(self):
+        # periods only depend on settings, so they are rebuilt when those change
+        self.period_table = PeriodTable(self.data["total_credits"], self.data["reset_day"])
+        self.current_period = None
+
+    def period(self):
+        # the period ending on the stored next reset date
+        if self.current_period is None:
+            next_reset = datetime.strptime(self.data["next_reset"], "%Y-%m-%d").date()
+            self.current_period = self.period_table.ending_on(next_reset)
+        return self.current_period
+
+    def period_for(self, day):
+        return self.period_table.period_for(day)
+
+    def periods_between(self, start_date, end_date):
+        return self.period_table.between(start_date, end_date)
+
+    def next_reset_date(self):
+        return self.period().end
+
+    def daily_target(self):
+        return self.period().daily_target
+
+    def calculate_ideal_usage(self, current_date):
+        # how much should have been used by current date
+        return self.period_for(current_date).ideal_usage(current_date)
+
+    def usage_series(self, start_date, end_date):
+        # one value per day as arrays; days without an entry use 0 and carry the last known remaining
+        # forward, starting from the last entry before the range (or the full allowance)
+        import numpy as np
+        
+        days = np.arange(np.datetime64(start_date, "D"), np.datetime64(end_date, "D") + 1)
+        length = len(days)
+
+        lo, hi = self.date_index.bounds(start_date, end_date)
+        ordinals = self.date_index.ordinals
+        entries = [self.data["daily_usage"][ordinal_to_date_str(o)] for o in ordinals[lo:hi]]
+        offsets = np.array(ordinals[lo:hi], dtype=np.int64) - start_date.toordinal()
+
+        # scatter the known entries onto the day grid
+        usage_data = np.zeros(length, dtype=np.int64)
+        usage_data[offsets] = [entry.get("used", 0) or 0 for entry in entries]
+        known_remaining = np.zeros(length, dtype=np.int64)
+        known_remaining[offsets] = [entry["remaining"] for entry in entries]
+
+        # forward-fill: every day points at the latest entry on or before it
+        last_known = np.full(length, -1, dtype=np.int64)
+        last_known[offsets] = offsets
+        np.maximum.accumulate(last_known, out=last_known)
+
+        if lo > 0:
+            seed = self.data["daily_usage"][ordinal_to_date_str(ordinals[lo - 1])]["remaining"]
+        else:
+            seed = self.data["total_credits"]
+        remaining_data = np.where(last_known >= 0, known_remaining[last_known], seed)
+
+        return UsageSeries(days.astype(object).tolist(), usage_data, remaining_data)
+
+    def series_stats(self, series, today):
+        # statistics and projection for a series, measured against the current period
+        from poe_analytics import series_stats
+        
+        days_until_reset = (self.next_reset_date() - today).days
+        if not series.dates:
+            return series_stats(series, None, days_until_reset)
+        return series_stats(series, self.stats(series.dates[0], series.dates[-1]), days_until_reset)
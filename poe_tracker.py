@@ -5,12 +5,19 @@ import tkinter as tk
 from tkinter import ttk, messagebox, colorchooser
 from datetime import datetime, timedelta
 import calendar
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
-import matplotlib.dates as mdates
-from tkcalendar import Calendar
-import numpy as np
+from poe_charts import (ChartRender, ChartRenderer, RenderCache, draw_daily_usage, draw_remaining_credits,
+                        draw_usage_heatmap, draw_usage_vs_target)
+from poe_periods import reset_date, shift_month
+from poe_storage import write_snapshot
+from poe_store import UsageStore
+from poe_widgets import EMPTY_CELL, DayCell, MonthCanvas, VirtualTreeview, YearCanvas
+
+def load_matplotlib():
+    # matplotlib is most of the cold start, so it is imported when the first chart is drawn rather
+    # than at launch; numpy and tkcalendar are likewise imported inside the code that uses them
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+    from matplotlib.figure import Figure
+    return Figure, FigureCanvasTkAgg
 
 class PoeTracker:
     def __init__(self, root):
@@ -35,7 +42,7 @@ class PoeTracker:
         
         # initialize data file
         self.data_file = "poe_tracker_data.json"
-        self.load_data()
+        self.store = UsageStore(self.data_file)
         
         # create the 'style'
         self.style = ttk.Style()
@@ -63,15 +70,23 @@ class PoeTracker:
         
         self.tab_control.pack(expand=1, fill="both", padx=10, pady=10)
         
-        # set up each tab
+        # view name -> render key from the last time it was drawn
+        self.rendered_views = {}
+        
+        # only the dashboard is built up front, the other tabs are built the first time they are shown
+        self.tab_setups = {
+            "calendar": self.setup_calendar_view,
+            "history": self.setup_history,
+            "analytics": self.setup_analytics,
+            "settings": self.setup_settings,
+        }
+        self.built_tabs = set()
+        
         self.setup_dashboard()
-        self.setup_calendar_view()
-        self.setup_history()
-        self.setup_analytics()
-        self.setup_settings()
         
-        # update the display
+        # update the display, the graph is filled in once matplotlib has loaded
         self.update_dashboard_display()
+        self.root.after_idle(self.root.after, 0, self.load_dashboard_graph)
         
         # bind tab change event
         self.tab_control.bind("<<NotebookTabChanged>>", self.on_tab_change)
@@ -79,70 +94,63 @@ class PoeTracker:
         # create status bar
         self.status_bar = tk.Label(root, text="Ready", bd=1, relief=tk.SUNKEN, anchor=tk.W)
         self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
-
-    def load_data(self):
-        if os.path.exists(self.data_file):
-            try:
-                with open(self.data_file, 'r') as f:
-                    self.data = json.load(f)
-                
-                # make sure all required fields exist
-                if "theme" not in self.data:
-                    self.data["theme"] = "light"
-                if "show_projections" not in self.data:
-                    self.data["show_projections"] = True
-                if "notifications" not in self.data:
-                    self.data["notifications"] = True
-                if "low_credit_threshold" not in self.data:
-                    self.data["low_credit_threshold"] = 20  # percentage
-            except json.JSONDecodeError:
-                self.initialize_default_data()
-        else:
-            self.initialize_default_data()
-
-    def initialize_default_data(self):
-        today = datetime.now()
-        reset_day = 29
+        self.store.on_save = self.on_data_saved
         
-        # calculate next reset date
-        if today.day <= reset_day:
-            next_reset = datetime(today.year, today.month, reset_day)
-        else:
-            if today.month == 12:
-                next_reset = datetime(today.year + 1, 1, reset_day)
-            else:
-                next_reset = datetime(today.year, today.month + 1, reset_day)
-        
-        self.data = {
-            "total_credits": 1000000,
-            "remaining_credits": 1000000,
-            "reset_day": reset_day,
-            "next_reset": next_reset.strftime("%Y-%m-%d"),
-            "daily_usage": {},
-            "last_updated": today.strftime("%Y-%m-%d"),
-            "theme": "light",
-            "show_projections": True,
-            "notifications": True,
-            "low_credit_threshold": 20,  # percentage
-            "notes": {}  # store notes for specific dates
-        }
-        self.save_data()
+        # fold the journal into the snapshot on exit
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    @property
+    def data(self):
+        # read-only view for the widgets, all changes go through self.store
+        return self.store.data
 
-    def save_data(self):
-        with open(self.data_file, 'w') as f:
-            json.dump(self.data, f, indent=4)
+    def on_data_saved(self):
         self.status_bar.config(text=f"Data saved: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
+    def on_close(self):
+        self.store.close()
+        self.root.destroy()
+
     def on_tab_change(self, event):
         tab_id = self.tab_control.select()
         tab_name = self.tab_control.tab(tab_id, "text")
         
+        # build the tab on first visit, then only redraw views whose data or filters changed since
+        # they were last shown
         if tab_name == "Calendar View":
-            self.update_calendar_display()
+            self.ensure_tab("calendar")
+            self.refresh_view("calendar", self.update_calendar_display)
         elif tab_name == "History":
-            self.update_history_display()
+            self.ensure_tab("history")
+            self.refresh_view("history", self.update_history_display)
         elif tab_name == "Analytics":
-            self.update_analytics_display()
+            self.ensure_tab("analytics")
+            self.refresh_view("analytics", self.update_analytics_display)
+        elif tab_name == "Settings":
+            self.ensure_tab("settings")
+
+    def ensure_tab(self, view):
+        if view not in self.built_tabs:
+            self.built_tabs.add(view)
+            self.tab_setups[view]()
+
+    def view_key(self, view):
+        # data version, today's date (ranges are relative to it) and the view's own filters
+        if view == "calendar":
+            params = (self.calendar_mode, self.current_calendar_date.year, self.current_calendar_date.month)
+        elif view == "history":
+            params = (self.date_range_var.get(), self.from_date_var.get(), self.to_date_var.get(),
+                      self.search_var.get())
+        else:
+            params = (self.chart_type_var.get(), self.chart_range_var.get())
+        return (self.store.version, datetime.now().date()) + params
+
+    def mark_rendered(self, view):
+        self.rendered_views[view] = self.view_key(view)
+
+    def refresh_view(self, view, update):
+        if self.rendered_views.get(view) != self.view_key(view):
+            update()
 
     def setup_dashboard(self):
         frame = self.dashboard_tab
@@ -316,15 +324,16 @@ class PoeTracker:
                                    bg=self.colors["background"])
         self.status_text.grid(row=3, column=2, sticky="w", pady=5)
         
-        # graph frame
-        graph_frame = tk.LabelFrame(frame, text="Usage Visualization", font=("Arial", 12, "bold"), 
-                                   padx=10, pady=10, bg=self.colors["background"])
-        graph_frame.grid(row=2, column=0, columnspan=2, sticky="nsew", pady=(20, 0))
+        # graph frame, the figure is created by load_dashboard_graph after the window is up
+        self.graph_frame = tk.LabelFrame(frame, text="Usage Visualization", font=("Arial", 12, "bold"), 
+                                        padx=10, pady=10, bg=self.colors["background"])
+        self.graph_frame.grid(row=2, column=0, columnspan=2, sticky="nsew", pady=(20, 0))
         
-        # create matplotlib figure
-        self.fig = Figure(figsize=(10, 4), dpi=100)
-        self.canvas = FigureCanvasTkAgg(self.fig, master=graph_frame)
-        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.graph_placeholder = tk.Label(self.graph_frame, text="Loading chart...", font=("Arial", 11), 
+                                          bg=self.colors["background"])
+        self.graph_placeholder.pack(fill=tk.BOTH, expand=True)
+        self.fig = None
+        self.dashboard_artists = None
         
         # configure grid weights
         frame.columnconfigure(0, weight=1)
@@ -360,46 +369,19 @@ class PoeTracker:
                                        font=("Arial", 12), bg=self.colors["primary"], fg="white")
         self.next_month_btn.pack(side=tk.LEFT)
         
-        # calendar grid
-        self.calendar_frame = tk.Frame(left_frame, bg=self.colors["background"])
-        self.calendar_frame.pack(fill=tk.BOTH, expand=True)
-        
-        # days of week header
-        days = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
-        for i, day in enumerate(days):
-            tk.Label(self.calendar_frame, text=day, font=("Arial", 10, "bold"), width=10, 
-                    bg=self.colors["primary"], fg="white").grid(row=0, column=i, sticky="nsew", padx=1, pady=1)
-        
-        # calendar cells (will be populated dynamically)
-        self.calendar_cells = []
-        for row in range(6):
-            cell_row = []
-            for col in range(7):
-                cell_frame = tk.Frame(self.calendar_frame, bg="white", bd=1, relief="solid", 
-                                     width=100, height=80)
-                cell_frame.grid(row=row+1, column=col, sticky="nsew", padx=1, pady=1)
-                cell_frame.grid_propagate(False)
-                
-                date_label = tk.Label(cell_frame, text="", font=("Arial", 10, "bold"), 
-                                     bg="white", anchor="nw")
-                date_label.place(x=5, y=5)
-                
-                usage_label = tk.Label(cell_frame, text="", font=("Arial", 9), bg="white", anchor="nw")
-                usage_label.place(x=5, y=25)
-                
-                cell_row.append({
-                    "frame": cell_frame,
-                    "date_label": date_label,
-                    "usage_label": usage_label,
-                    "date": None
-                })
-            self.calendar_cells.append(cell_row)
-        
-        # configure grid weights for calendar cells
-        for i in range(7):
-            self.calendar_frame.columnconfigure(i, weight=1)
-        for i in range(7):
-            self.calendar_frame.rowconfigure(i, weight=1)
+        # switch between the month grid and a whole-year overview
+        self.calendar_mode = "month"
+        self.calendar_mode_btn = tk.Button(nav_frame, text="Year View", command=self.toggle_calendar_mode, 
+                                          font=("Arial", 11), bg=self.colors["secondary"], fg="white")
+        self.calendar_mode_btn.pack(side=tk.RIGHT)
+        
+        # calendar grid, drawn on one canvas
+        self.month_canvas = MonthCanvas(left_frame, self.select_calendar_day, self.colors["primary"],
+                                        background=self.colors["background"])
+        self.month_canvas.canvas.pack(fill=tk.BOTH, expand=True)
+        
+        # year overview, shown instead of the month grid
+        self.year_canvas = YearCanvas(left_frame, self.select_year_day, background=self.colors["background"])
         
         # right panel - day details
         right_frame = tk.LabelFrame(frame, text="Day Details", font=("Arial", 12, "bold"), 
@@ -469,6 +451,11 @@ class PoeTracker:
         # set current month
         self.current_calendar_date = datetime.now()
         
+        # (year, month) -> DayCells, valid for one data version and day
+        self.month_cells_cache = {}
+        self.month_cells_key = None
+        self.month_prefetch_job = None
+        
         # configure grid weights
         frame.columnconfigure(0, weight=1)
         frame.columnconfigure(1, weight=1)
@@ -525,29 +512,37 @@ class PoeTracker:
         tk.Label(search_frame, text="Search:", font=("Arial", 11), 
                 bg=self.colors["background"]).pack(side=tk.LEFT, padx=(0, 5))
         self.search_var = tk.StringVar()
-        search_entry = tk.Entry(search_frame, textvariable=self.search_var, font=("Arial", 11), width=15)
+        search_entry = tk.Entry(search_frame, textvariable=self.search_var, font=("Arial", 11), width=30)
         search_entry.pack(side=tk.LEFT)
-        search_entry.bind("<KeyRelease>", lambda e: self.update_history_display())
+        # refilter once typing pauses rather than on every keystroke
+        self.history_search_job = None
+        self.search_var.trace_add("write", lambda *args: self.schedule_history_search())
         
         # export button
         export_btn = tk.Button(filter_frame, text="Export Data", command=self.export_history, 
                               font=("Arial", 11), bg=self.colors["accent"], fg="white")
         export_btn.pack(side=tk.RIGHT, padx=10)
         
-        # create treeview for history
+        # create treeview for history, only the rows in view are materialized
         columns = ("date", "remaining", "used_today", "daily_target", "status", "note")
-        self.history_tree = ttk.Treeview(frame, columns=columns, show="headings", height=20)
-        
-        # define headings
+        self.history_view = VirtualTreeview(frame, columns, self.format_history_row, show="headings", height=20)
+        self.history_tree = self.history_view.tree
+        self.history_target = self.store.daily_target()
+        
+        # define headings, sorted newest first until a heading is clicked
+        self.history_headings = {"date": "Date", "remaining": "Remaining Credits", "used_today": "Used Today",
+                                 "daily_target": "Daily Target", "status": "Status", "note": "Note"}
+        self.history_sort = ("date", True)
         self.history_tree.heading("date", text="Date", command=lambda: self.sort_history_by_column("date"))
         self.history_tree.heading("remaining", text="Remaining Credits", 
                                  command=lambda: self.sort_history_by_column("remaining"))
         self.history_tree.heading("used_today", text="Used Today", 
                                  command=lambda: self.sort_history_by_column("used_today"))
-        self.history_tree.heading("daily_target", text="Daily Target", 
-                                 command=lambda: self.sort_history_by_column("daily_target"))
+        # every row shows the same daily target, so like status and note it isn't sortable
+        self.history_tree.heading("daily_target", text="Daily Target")
         self.history_tree.heading("status", text="Status")
         self.history_tree.heading("note", text="Note")
+        self.update_history_headings()
         
         # define columns
         self.history_tree.column("date", width=100, anchor="center")
@@ -557,13 +552,9 @@ class PoeTracker:
         self.history_tree.column("status", width=100, anchor="center")
         self.history_tree.column("note", width=250, anchor="w")
         
-        # add scrollbar
-        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=self.history_tree.yview)
-        self.history_tree.configure(yscrollcommand=scrollbar.set)
-        
         # place treeview and scrollbar
         self.history_tree.grid(row=2, column=0, sticky="nsew", padx=(20, 0), pady=(10, 20))
-        scrollbar.grid(row=2, column=1, sticky="ns", padx=(0, 20), pady=(10, 20))
+        self.history_view.scrollbar.grid(row=2, column=1, sticky="ns", padx=(0, 20), pady=(10, 20))
         
         # bind double-click to edit
         self.history_tree.bind("<Double-1>", self.edit_history_item)
@@ -622,9 +613,19 @@ class PoeTracker:
         chart_frame = tk.Frame(left_frame, bg="white", bd=1, relief="solid")
         chart_frame.pack(fill=tk.BOTH, expand=True)
         
-        self.analytics_fig = Figure(figsize=(8, 6), dpi=100)
-        self.analytics_canvas = FigureCanvasTkAgg(self.analytics_fig, master=chart_frame)
-        self.analytics_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        # charts are rendered off the Tk thread and shown here as an image
+        self.analytics_view = tk.Canvas(chart_frame, width=800, height=600, bg="white", highlightthickness=0)
+        self.analytics_view.pack(fill=tk.BOTH, expand=True)
+        self.analytics_image = self.analytics_view.create_image(0, 0, anchor="nw")
+        self.analytics_status = self.analytics_view.create_text(10, 10, anchor="nw", text="", 
+                                                                font=("Arial", 10), fill="gray")
+        self.analytics_photo = None
+        self.analytics_pending = None
+        self.analytics_resize_job = None
+        self.analytics_view.bind("<Configure>", self.on_analytics_resize)
+        
+        self.chart_cache = RenderCache()
+        self.chart_renderer = ChartRenderer(self.root)
         
         # right panel - stats
         right_frame = tk.Frame(frame, bg=self.colors["background"])
@@ -769,10 +770,23 @@ class PoeTracker:
                                             bg=self.colors["background"])
         notifications_check.grid(row=5, column=0, columnspan=2, sticky="w", pady=10)
         
+        # Storage backend
+        tk.Label(settings_frame, text="Storage:", font=("Arial", 11), 
+                bg=self.colors["background"]).grid(row=6, column=0, sticky="w", pady=10)
+        
+        self.storage_var = tk.StringVar(value="sqlite" if self.store.storage.name == "sqlite" else "journal")
+        storage_frame = tk.Frame(settings_frame, bg=self.colors["background"])
+        storage_frame.grid(row=6, column=1, sticky="w", pady=10)
+        
+        tk.Radiobutton(storage_frame, text="JSON", variable=self.storage_var, value="journal", 
+                      bg=self.colors["background"]).pack(side=tk.LEFT, padx=(0, 10))
+        tk.Radiobutton(storage_frame, text="SQLite", variable=self.storage_var, value="sqlite", 
+                      bg=self.colors["background"]).pack(side=tk.LEFT)
+        
         # Save button
         save_btn = tk.Button(settings_frame, text="Save Settings", command=self.save_settings, 
                             font=("Arial", 11, "bold"), bg=self.colors["primary"], fg="white", padx=15)
-        save_btn.grid(row=6, column=0, columnspan=2, pady=20)
+        save_btn.grid(row=7, column=0, columnspan=2, pady=20)
         
         # Data management frame
         data_frame = tk.LabelFrame(frame, text="Data Management", font=("Arial", 12, "bold"), 
@@ -838,24 +852,23 @@ class PoeTracker:
         self.progress_label.config(text=f"{usage_percentage:.1f}% Used")
         
         # Format next reset date
-        next_reset = datetime.strptime(self.data["next_reset"], "%Y-%m-%d")
+        next_reset = self.store.next_reset_date()
         self.reset_label.config(text=next_reset.strftime("%b %d, %Y"))
         
         # Calculate days until reset
         today = datetime.now().date()
-        days_until_reset = (next_reset.date() - today).days
+        days_until_reset = (next_reset - today).days
         self.days_remaining_label.config(text=str(days_until_reset))
         
         # Calculate averages
-        days_in_month = calendar.monthrange(next_reset.year, next_reset.month)[1]
-        daily_avg = self.data["total_credits"] / days_in_month
+        daily_avg = self.store.daily_target()
         self.daily_avg_label.config(text=f"{daily_avg:,.2f}")
         
         weekly_avg = daily_avg * 7
         self.weekly_avg_label.config(text=f"{weekly_avg:,.2f}")
         
         # Calculate extra credits available
-        ideal_usage = self.calculate_ideal_usage(today)
+        ideal_usage = self.store.calculate_ideal_usage(today)
         actual_usage = self.data["total_credits"] - self.data["remaining_credits"]
         extra_available = ideal_usage - actual_usage
         
@@ -868,26 +881,18 @@ class PoeTracker:
         today_str = today.strftime("%Y-%m-%d")
         yesterday_str = (today - timedelta(days=1)).strftime("%Y-%m-%d")
         
-        today_usage = 0
-        if today_str in self.data["daily_usage"]:
-            today_usage = self.data["daily_usage"][today_str].get("used", 0)
+        today_usage = self.store.used_on(today_str)
         self.today_usage_label.config(text=f"{today_usage:,}")
         
         # Update yesterday's usage
-        yesterday_usage = 0
-        if yesterday_str in self.data["daily_usage"]:
-            yesterday_usage = self.data["daily_usage"][yesterday_str].get("used", 0)
+        yesterday_usage = self.store.used_on(yesterday_str)
         self.yesterday_usage_label.config(text=f"{yesterday_usage:,}")
         
         # Calculate last 7 days average
-        last_7_days = []
-        for i in range(7):
-            day = (today - timedelta(days=i)).strftime("%Y-%m-%d")
-            if day in self.data["daily_usage"]:
-                last_7_days.append(self.data["daily_usage"][day].get("used", 0))
-        
-        if last_7_days:
-            week_avg = sum(last_7_days) / len(last_7_days)
+        week_stats = self.store.stats(today - timedelta(days=6), today)
+        
+        if week_stats.entries:
+            week_avg = week_stats.total_used / week_stats.entries
             self.week_avg_usage_label.config(text=f"{week_avg:,.2f}")
         else:
             self.week_avg_usage_label.config(text="0")
@@ -905,190 +910,239 @@ class PoeTracker:
         # Update remaining credits entry with current value
         self.remaining_entry_var.set(str(self.data["remaining_credits"]))
 
-    def update_dashboard_graph(self):
-        self.fig.clear()
+    def load_dashboard_graph(self):
+        # runs once the first paint is done: import matplotlib and fill in the graph
+        Figure, FigureCanvasTkAgg = load_matplotlib()
         
-        # Create two subplots
+        self.fig = Figure(figsize=(10, 4), dpi=100)
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.graph_frame)
+        self.graph_placeholder.destroy()
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.update_dashboard_graph()
+
+    def build_dashboard_graph(self):
+        # Create two subplots with every artist the graph needs, later updates only change them
         gs = self.fig.add_gridspec(1, 2, width_ratios=[2, 1])
         ax1 = self.fig.add_subplot(gs[0])
         ax2 = self.fig.add_subplot(gs[1])
         
+        # Plot 1: Daily usage vs target, one bar and value label per day of the last 14
+        days = range(14)
+        bars = ax1.bar(days, [0] * 14, alpha=0.7)
+        bar_labels = [ax1.text(day, 0, "", ha='center', va='bottom', rotation=90, fontsize=8, visible=False)
+                      for day in days]
+        target_line = ax1.axhline(y=0, color='r', linestyle='--', alpha=0.7, label='Daily Target')
+        
+        ax1.set_xlabel('Date')
+        ax1.set_ylabel('Credits Used')
+        ax1.set_title('Daily Usage vs Target')
+        ax1.legend()
+        
+        # Plot 2: Credits remaining as a donut
+        wedges, _ = ax2.pie([50, 50], 
+                           startangle=90, 
+                           counterclock=False,
+                           wedgeprops={'width': 0.3, 'edgecolor': 'w'})
+        
+        # Add text in center
+        center_text = ax2.text(0, 0, "", ha='center', va='center', fontsize=12, fontweight='bold')
+        
+        ax2.set_title('Remaining Credits')
+        ax2.axis('equal')
+        
+        self.dashboard_artists = {
+            "ax1": ax1,
+            "bars": bars,
+            "bar_labels": bar_labels,
+            "target_line": target_line,
+            "wedges": wedges,
+            "center_text": center_text,
+        }
+        
+        # Adjust layout once, values changing later don't move the axes
+        ax1.set_xticks(days, ["00/00"] * 14, rotation=45, ha='right')
+        self.fig.tight_layout()
+
+    def update_dashboard_graph(self):
+        if self.fig is None:
+            return
+        if self.dashboard_artists is None:
+            self.build_dashboard_graph()
+        artists = self.dashboard_artists
+        ax1 = artists["ax1"]
+        
         # Get the last 14 days of data
         today = datetime.now().date()
-        dates = []
-        usage_data = []
-        remaining_data = []
-        target_data = []
+        dates, usage_data, remaining_data = self.store.usage_series(today - timedelta(days=13), today)
         
         # Calculate daily target
-        next_reset = datetime.strptime(self.data["next_reset"], "%Y-%m-%d").date()
-        days_in_month = calendar.monthrange(next_reset.year, next_reset.month)[1]
-        daily_target = self.data["total_credits"] / days_in_month
-        
-        for i in range(13, -1, -1):
-            date = today - timedelta(days=i)
-            date_str = date.strftime("%Y-%m-%d")
-            dates.append(date)
-            
-            if date_str in self.data["daily_usage"]:
-                entry = self.data["daily_usage"][date_str]
-                usage_data.append(entry.get("used", 0))
-                remaining_data.append(entry["remaining"])
-            else:
-                usage_data.append(0)
-                # For remaining, use the last known value or total
-                if remaining_data:
-                    remaining_data.append(remaining_data[-1])
-                else:
-                    remaining_data.append(self.data["total_credits"])
-            
-            target_data.append(daily_target)
+        daily_target = self.store.daily_target()
         
-        # Plot 1: Daily usage vs target
-        bar_colors = []
-        for usage in usage_data:
+        # Plot 1: bar heights, colors and value labels
+        for bar, label, usage in zip(artists["bars"], artists["bar_labels"], usage_data):
             if usage > daily_target * 1.2:
-                bar_colors.append(self.colors["danger"])
+                bar.set_facecolor(self.colors["danger"])
             elif usage > daily_target:
-                bar_colors.append(self.colors["warning"])
+                bar.set_facecolor(self.colors["warning"])
             else:
-                bar_colors.append(self.colors["good"])
-        
-        bars = ax1.bar([d.strftime("%m/%d") for d in dates], usage_data, color=bar_colors, alpha=0.7)
-        ax1.axhline(y=daily_target, color='r', linestyle='--', alpha=0.7, label='Daily Target')
-        
-        # Add value labels to bars
-        for bar in bars:
-            height = bar.get_height()
-            if height > 0:
-                ax1.text(bar.get_x() + bar.get_width()/2., height + 5000,
-                        f'{height:,.0f}', ha='center', va='bottom', rotation=90, fontsize=8)
-        
-        ax1.set_xlabel('Date')
-        ax1.set_ylabel('Credits Used')
-        ax1.set_title('Daily Usage vs Target')
-        ax1.legend()
+                bar.set_facecolor(self.colors["good"])
+            bar.set_height(usage)
+            
+            label.set_position((bar.get_x() + bar.get_width()/2., usage + 5000))
+            label.set_text(f'{usage:,.0f}')
+            label.set_visible(bool(usage > 0))
         
-        # Rotate x-axis labels for better readability
-        ax1.set_xticklabels([d.strftime("%m/%d") for d in dates], rotation=45, ha='right')
+        artists["target_line"].set_ydata([daily_target, daily_target])
+        ax1.set_xticks(range(len(dates)), [d.strftime("%m/%d") for d in dates], rotation=45, ha='right')
+        ax1.relim()
+        ax1.autoscale_view()
         
         # Plot 2: Credits remaining
         remaining_percentage = (self.data["remaining_credits"] / self.data["total_credits"]) * 100
         
-        # Create a pie chart for remaining credits
         if remaining_percentage <= self.data["low_credit_threshold"]:
-            colors = [self.colors["danger"], '#e0e0e0']
+            color = self.colors["danger"]
         elif remaining_percentage <= 50:
-            colors = [self.colors["warning"], '#e0e0e0']
+            color = self.colors["warning"]
         else:
-            colors = [self.colors["good"], '#e0e0e0']
-        
-        ax2.pie([remaining_percentage, 100-remaining_percentage], 
-               colors=colors, 
-               startangle=90, 
-               counterclock=False,
-               wedgeprops={'width': 0.3, 'edgecolor': 'w'})
+            color = self.colors["good"]
+        
+        # wedges run clockwise from 12 o'clock, remaining first
+        split = 90 - 3.6 * max(min(remaining_percentage, 100), 0)
+        remaining_wedge, used_wedge = artists["wedges"]
+        remaining_wedge.set_theta1(split)
+        remaining_wedge.set_theta2(90)
+        remaining_wedge.set_facecolor(color)
+        used_wedge.set_theta1(-270)
+        used_wedge.set_theta2(split)
+        used_wedge.set_facecolor('#e0e0e0')
+        
+        artists["center_text"].set_text(f"{remaining_percentage:.1f}%\nRemaining")
+        
+        # Redraw when Tk is idle, several updates in a row cost one draw
+        self.canvas.draw_idle()
+
+    def update_calendar_display(self):
+        # a tab that hasn't been built yet is drawn when it is first shown
+        if "calendar" not in self.built_tabs:
+            return
+        self.mark_rendered("calendar")
         
-        # Add text in center
-        ax2.text(0, 0, f"{remaining_percentage:.1f}%\nRemaining", 
-                ha='center', va='center', fontsize=12, fontweight='bold')
+        if self.calendar_mode == "year":
+            self.update_year_display()
+            return
         
-        ax2.set_title('Remaining Credits')
-        ax2.axis('equal')
+        # Update month/year label
+        self.month_year_label.config(text=self.current_calendar_date.strftime("%B %Y"))
         
-        # Adjust layout
-        self.fig.tight_layout()
+        # the canvas only touches cells that differ from the month shown before
+        year, month = self.current_calendar_date.year, self.current_calendar_date.month
+        self.month_canvas.show(self.cached_month_cells(year, month))
         
-        # Update canvas
-        self.canvas.draw()
+        # have the neighbouring months ready by the time the user pages to them
+        if self.month_prefetch_job:
+            self.root.after_cancel(self.month_prefetch_job)
+        self.month_prefetch_job = self.root.after_idle(self.prefetch_adjacent_months, year, month)
 
-    def update_calendar_display(self):
-        # Get current month and year
+    def update_year_display(self):
+        import numpy as np
+        
         year = self.current_calendar_date.year
-        month = self.current_calendar_date.month
+        self.month_year_label.config(text=str(year))
         
-        # Update month/year label
-        self.month_year_label.config(text=self.current_calendar_date.strftime("%B %Y"))
+        # one color per day from the usage/target ratios, mapped in a single vectorized step
+        ratios = self.store.usage_ratios(datetime(year, 1, 1).date(), datetime(year, 12, 31).date())
+        palette = np.array(["white", "#d9f2d9", "#fff2cc", "#ffcccc"])  # no data, on track, warning, over
+        classes = np.select([np.isnan(ratios), ratios > 1.2, ratios > 1], [0, 3, 2], default=1)
         
-        # Get first day of month and number of days
-        first_day = datetime(year, month, 1)
+        self.year_canvas.draw(year, palette[classes].tolist(), highlight=datetime.now().date())
+
+    def toggle_calendar_mode(self):
+        if self.calendar_mode == "month":
+            self.calendar_mode = "year"
+            self.month_canvas.canvas.pack_forget()
+            self.year_canvas.canvas.pack(fill=tk.BOTH, expand=True)
+            self.calendar_mode_btn.config(text="Month View")
+        else:
+            self.calendar_mode = "month"
+            self.year_canvas.canvas.pack_forget()
+            self.month_canvas.canvas.pack(fill=tk.BOTH, expand=True)
+            self.calendar_mode_btn.config(text="Year View")
+        self.update_calendar_display()
+
+    def select_year_day(self, date_str):
+        # remember the month so switching back to the month grid lands on it
+        date_obj = datetime.strptime(date_str, "%Y-%m-%d")
+        self.current_calendar_date = datetime(date_obj.year, date_obj.month, 1)
+        self.select_calendar_day(date_str)
+
+    def cached_month_cells(self, year, month):
+        # month cells depend on the data and on today, any change to either drops the whole cache
+        cache_key = (self.store.version, datetime.now().date())
+        if self.month_cells_key != cache_key:
+            self.month_cells_key = cache_key
+            self.month_cells_cache = {}
+        
+        cells = self.month_cells_cache.get((year, month))
+        if cells is None:
+            cells = self.month_cells_cache[(year, month)] = self.calendar_month_cells(year, month)
+        return cells
+
+    def prefetch_adjacent_months(self, year, month):
+        self.month_prefetch_job = None
+        for delta in (-1, 1):
+            self.cached_month_cells(*shift_month(year, month, delta))
+
+    def calendar_month_cells(self, year, month):
+        # the 42 cells of a month grid, Monday first
         days_in_month = calendar.monthrange(year, month)[1]
+        first_weekday = calendar.weekday(year, month, 1)  # 0 = Monday, 6 = Sunday
         
         # Calculate daily target
-        next_reset = datetime.strptime(self.data["next_reset"], "%Y-%m-%d")
-        month_days = calendar.monthrange(next_reset.year, next_reset.month)[1]
-        daily_target = self.data["total_credits"] / month_days
-        
-        # Clear all cells
-        for row in self.calendar_cells:
-            for cell in row:
-                cell["frame"].config(bg="white")
-                cell["date_label"].config(text="", bg="white")
-                cell["usage_label"].config(text="", bg="white")
-                cell["date"] = None
-        
-        # Calculate offset (0 = Monday in calendar.monthrange)
-        first_weekday = first_day.weekday()  # 0 = Monday, 6 = Sunday
-        
-        # Fill the calendar
-        day = 1
-        for row in range(6):
-            for col in range(7):
-                if (row == 0 and col < first_weekday) or day > days_in_month:
-                    # Empty cell
-                    continue
-                
-                # Set date
-                date = datetime(year, month, day)
-                date_str = date.strftime("%Y-%m-%d")
-                
-                cell = self.calendar_cells[row][col]
-                cell["date"] = date_str
-                cell["date_label"].config(text=str(day))
-                
-                # Check if we have data for this day
-                if date_str in self.data["daily_usage"]:
-                    entry = self.data["daily_usage"][date_str]
-                    used = entry.get("used", 0)
-                    
-                    # Set usage text
-                    cell["usage_label"].config(text=f"Used: {used:,}")
-                    
-                    # Color code based on usage vs target
-                    if used > daily_target * 1.2:
-                        bg_color = "#ffcccc"  # Light red
-                    elif used > daily_target:
-                        bg_color = "#fff2cc"  # Light yellow
-                    else:
-                        bg_color = "#d9f2d9"  # Light green
-                    
-                    cell["frame"].config(bg=bg_color)
-                    cell["date_label"].config(bg=bg_color)
-                    cell["usage_label"].config(bg=bg_color)
-                
-                # Highlight today
-                if date.date() == datetime.now().date():
-                    cell["date_label"].config(font=("Arial", 10, "bold"), fg="blue")
-                
-                # Highlight reset day
-                if day == self.data["reset_day"]:
-                    cell["date_label"].config(font=("Arial", 10, "bold"), fg="purple")
-                
-                # Bind click event
-                cell["frame"].bind("<Button-1>", lambda e, d=date_str: self.select_calendar_day(d))
-                cell["date_label"].bind("<Button-1>", lambda e, d=date_str: self.select_calendar_day(d))
-                cell["usage_label"].bind("<Button-1>", lambda e, d=date_str: self.select_calendar_day(d))
+        daily_target = self.store.daily_target()
+        today = datetime.now().date()
+        reset = reset_date(year, month, self.data["reset_day"])
+        
+        cells = [EMPTY_CELL] * first_weekday
+        for day in range(1, days_in_month + 1):
+            date = datetime(year, month, day).date()
+            date_str = date.strftime("%Y-%m-%d")
+            
+            usage_text = ""
+            bg_color = "white"
+            
+            # Check if we have data for this day
+            entry = self.data["daily_usage"].get(date_str)
+            if entry:
+                used = entry.get("used", 0)
+                usage_text = f"Used: {used:,}"
                 
-                day += 1
+                # Color code based on usage vs target
+                if used > daily_target * 1.2:
+                    bg_color = "#ffcccc"  # Light red
+                elif used > daily_target:
+                    bg_color = "#fff2cc"  # Light yellow
+                else:
+                    bg_color = "#d9f2d9"  # Light green
+            
+            # Highlight reset day, then today
+            if date == reset:
+                fg_color = "purple"
+            elif date == today:
+                fg_color = "blue"
+            else:
+                fg_color = "black"
+            
+            cells.append(DayCell(date_str, str(day), usage_text, bg_color, fg_color))
+        
+        return cells + [EMPTY_CELL] * (42 - len(cells))
 
     def select_calendar_day(self, date_str):
         # Update selected date
         self.selected_date_label.config(text=datetime.strptime(date_str, "%Y-%m-%d").strftime("%B %d, %Y"))
         
         # Calculate daily target
-        next_reset = datetime.strptime(self.data["next_reset"], "%Y-%m-%d")
-        days_in_month = calendar.monthrange(next_reset.year, next_reset.month)[1]
-        daily_target = self.data["total_credits"] / days_in_month
+        daily_target = self.store.daily_target()
         
         # Update day details
         if date_str in self.data["daily_usage"]:
@@ -1134,27 +1188,16 @@ class PoeTracker:
                 self.cal_note_text.insert(tk.END, self.data["notes"][date_str])
 
     def prev_month(self):
-        # Move to previous month
-        year = self.current_calendar_date.year
-        month = self.current_calendar_date.month
-        
-        if month == 1:
-            self.current_calendar_date = datetime(year - 1, 12, 1)
-        else:
-            self.current_calendar_date = datetime(year, month - 1, 1)
-        
-        self.update_calendar_display()
+        # Move to previous month, or year in the year view
+        self.shift_calendar(-12 if self.calendar_mode == "year" else -1)
 
     def next_month(self):
-        # Move to next month
-        year = self.current_calendar_date.year
-        month = self.current_calendar_date.month
-        
-        if month == 12:
-            self.current_calendar_date = datetime(year + 1, 1, 1)
-        else:
-            self.current_calendar_date = datetime(year, month + 1, 1)
-        
+        # Move to next month, or year in the year view
+        self.shift_calendar(12 if self.calendar_mode == "year" else 1)
+
+    def shift_calendar(self, months):
+        year, month = shift_month(self.current_calendar_date.year, self.current_calendar_date.month, months)
+        self.current_calendar_date = datetime(year, month, 1)
         self.update_calendar_display()
 
     def save_day_note(self):
@@ -1168,22 +1211,10 @@ class PoeTracker:
         date_obj = datetime.strptime(selected_date, "%B %d, %Y")
         date_str = date_obj.strftime("%Y-%m-%d")
         
-        # Get note text
+        # Get note text, an empty note removes it
         note = self.cal_note_text.get(1.0, tk.END).strip()
+        self.store.set_note(date_str, note)
         
-        # Initialize notes dict if it doesn't exist
-        if "notes" not in self.data:
-            self.data["notes"] = {}
-        
-        # Save note
-        if note:
-            self.data["notes"][date_str] = note
-        else:
-            # Remove note if empty
-            if date_str in self.data["notes"]:
-                del self.data["notes"][date_str]
-        
-        self.save_data()
         messagebox.showinfo("Note Saved", f"Note for {selected_date} has been saved.")
 
     def edit_day_usage(self):
@@ -1251,40 +1282,8 @@ class PoeTracker:
         try:
             remaining = int(remaining_str.replace(',', ''))
             
-            # Calculate usage
-            if date_str not in self.data["daily_usage"]:
-                # First entry of the day
-                prev_date = self.get_previous_date(date_str)
-                if prev_date:
-                    prev_remaining = self.data["daily_usage"][prev_date]["remaining"]
-                    used_today = prev_remaining - remaining
-                else:
-                    # No previous data, assume starting from total
-                    used_today = self.data["total_credits"] - remaining
-            else:
-                # Update existing entry
-                prev_date = self.get_previous_date(date_str)
-                if prev_date:
-                    prev_remaining = self.data["daily_usage"][prev_date]["remaining"]
-                    used_today = prev_remaining - remaining
-                else:
-                    # No previous data, calculate from total
-                    used_today = self.data["total_credits"] - remaining
-            
-            # Update data
-            self.data["daily_usage"][date_str] = {
-                "remaining": remaining,
-                "used": used_today,
-                "date": date_str
-            }
-            
-            # If this is the most recent entry, update remaining credits
-            latest_date = max(self.data["daily_usage"].keys()) if self.data["daily_usage"] else None
-            if latest_date == date_str:
-                self.data["remaining_credits"] = remaining
-            
             # Save and update displays
-            self.save_data()
+            self.store.edit_usage(date_str, remaining)
             self.update_dashboard_display()
             self.update_calendar_display()
             self.select_calendar_day(date_str)
@@ -1296,31 +1295,19 @@ class PoeTracker:
 
     def delete_usage_entry(self, date_str, window):
         if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete the entry for {date_str}?"):
-            if date_str in self.data["daily_usage"]:
-                del self.data["daily_usage"][date_str]
-                
-                # Update remaining credits if this was the latest entry
-                if self.data["daily_usage"]:
-                    latest_date = max(self.data["daily_usage"].keys())
-                    self.data["remaining_credits"] = self.data["daily_usage"][latest_date]["remaining"]
-                else:
-                    self.data["remaining_credits"] = self.data["total_credits"]
-                
-                self.save_data()
+            if self.store.delete_usage(date_str):
                 self.update_dashboard_display()
                 self.update_calendar_display()
                 
                 window.destroy()
 
     def update_history_display(self):
-        # Clear existing items
-        for item in self.history_tree.get_children():
-            self.history_tree.delete(item)
+        if "history" not in self.built_tabs:
+            return
+        self.mark_rendered("history")
         
         # Get daily target
-        next_reset = datetime.strptime(self.data["next_reset"], "%Y-%m-%d")
-        days_in_month = calendar.monthrange(next_reset.year, next_reset.month)[1]
-        daily_target = self.data["total_credits"] / days_in_month
+        self.history_target = self.store.daily_target()
         
         # Filter by date range
         date_range = self.date_range_var.get()
@@ -1360,72 +1347,98 @@ class PoeTracker:
             # Hide custom range frame
             self.custom_range_frame.pack_forget()
         
-        # Filter by search text
-        search_text = self.search_var.get().lower()
-        
-        # Sort dates and add to treeview
-        sorted_dates = sorted(self.data["daily_usage"].keys(), 
-                             key=lambda x: datetime.strptime(x, "%Y-%m-%d"), 
-                             reverse=True)
+        # Filter by search text, plain words or filter terms like used>40000 status:over weekday:sat
+        search_text = self.search_var.get().strip()
         
-        for date_str in sorted_dates:
-            entry_date = datetime.strptime(date_str, "%Y-%m-%d").date()
+        # Dates in range, newest first
+        if search_text:
+            # the query language compiles to numpy masks, so it loads with the first search
+            from poe_query import QueryError, compile_query
             
-            # Apply date filter
-            if entry_date < start_date or entry_date > end_date:
-                continue
-            
-            entry = self.data["daily_usage"][date_str]
-            used = entry.get("used", 0)
-            
-            # Get note if exists
-            note = self.data.get("notes", {}).get(date_str, "")
-            
-            # Apply search filter
-            if search_text and search_text not in date_str.lower() and search_text not in note.lower():
-                continue
-            
-            # Determine status
-            if used > daily_target * 1.2:
-                status = "Over Budget"
-            elif used > daily_target:
-                status = "Warning"
-            else:
-                status = "On Track"
-            
-            self.history_tree.insert("", "end", values=(
-                date_str,
-                f"{entry['remaining']:,}",
-                f"{used:,}",
-                f"{daily_target:,.2f}",
-                status,
-                note[:50] + ("..." if len(note) > 50 else "")
-            ))
+            try:
+                query = compile_query(search_text)
+            except QueryError as e:
+                # probably still being typed, keep the current rows
+                self.status_bar.config(text=f"Search: {e}")
+                return
+            if self.status_bar.cget("text").startswith("Search: "):
+                self.status_bar.config(text="Ready")
+            sorted_dates = self.store.query_dates(start_date, end_date, query, newest_first=True)
+        else:
+            sorted_dates = self.store.dates_between(start_date, end_date, newest_first=True)
+        
+        # rows are formatted by the view as they scroll in
+        self.history_view.set_rows(self.sort_history_dates(sorted_dates))
+
+    def schedule_history_search(self):
+        if self.history_search_job:
+            self.root.after_cancel(self.history_search_job)
+        self.history_search_job = self.root.after(200, self.run_history_search)
+
+    def run_history_search(self):
+        self.history_search_job = None
+        self.update_history_display()
+
+    def format_history_row(self, date_str):
+        entry = self.data["daily_usage"][date_str]
+        used = entry.get("used", 0)
+        daily_target = self.history_target
+        
+        # Get note if exists
+        note = self.store.note(date_str)
+        
+        # Determine status
+        if used > daily_target * 1.2:
+            status = "Over Budget"
+        elif used > daily_target:
+            status = "Warning"
+        else:
+            status = "On Track"
+        
+        return (
+            date_str,
+            f"{entry['remaining']:,}",
+            f"{used:,}",
+            f"{daily_target:,.2f}",
+            status,
+            note[:50] + ("..." if len(note) > 50 else "")
+        )
 
     def sort_history_by_column(self, column):
-        # Get all items
-        items = [(self.history_tree.set(item, column), item) for item in self.history_tree.get_children('')]
-        
-        # Sort items
-        items.sort(reverse=True)
+        # Clicking the sorted column again flips the direction
+        sort_column, descending = self.history_sort
+        self.history_sort = (column, not descending if column == sort_column else True)
+        self.update_history_headings()
         
-        # Rearrange items in sorted positions
-        for index, (_, item) in enumerate(items):
-            self.history_tree.move(item, '', index)
+        # Sort the whole result set on the underlying values, not the display strings
+        self.history_view.set_rows(self.sort_history_dates(self.history_view.keys))
+
+    def sort_history_dates(self, date_strs):
+        column, descending = self.history_sort
+        field = {"date": "date", "remaining": "remaining", "used_today": "used"}[column]
+        return self.store.sort_dates(date_strs, field, descending)
+
+    def update_history_headings(self):
+        column, descending = self.history_sort
+        for name, text in self.history_headings.items():
+            if name == column:
+                text += " ▼" if descending else " ▲"
+            self.history_tree.heading(name, text=text)
 
     def edit_history_item(self, event=None):
         # Get selected item
-        selected = self.history_tree.selection()
+        selected = self.history_view.selection()
         if not selected:
             return
         
-        # Get date from selected item
-        date_str = self.history_tree.item(selected[0], "values")[0]
+        # rows are keyed by date
+        date_str = selected[0]
         
         # Convert to calendar date
         date_obj = datetime.strptime(date_str, "%Y-%m-%d")
         
-        # Switch to calendar tab and select date
+        # Switch to calendar tab and select date, the tab change event only arrives later
+        self.ensure_tab("calendar")
         self.tab_control.select(self.calendar_tab)
         
         # Set calendar to correct month
@@ -1440,36 +1453,34 @@ class PoeTracker:
 
     def delete_history_item(self):
         # Get selected item
-        selected = self.history_tree.selection()
+        selected = self.history_view.selection()
         if not selected:
             return
         
-        # Get date from selected item
-        date_str = self.history_tree.item(selected[0], "values")[0]
+        # rows are keyed by date
+        date_str = selected[0]
         
         if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete the entry for {date_str}?"):
-            if date_str in self.data["daily_usage"]:
-                del self.data["daily_usage"][date_str]
+            if self.store.delete_usage(date_str):
+                self.update_dashboard_display()
                 
-                # Update remaining credits if this was the latest entry
-                if self.data["daily_usage"]:
-                    latest_date = max(self.data["daily_usage"].keys())
-                    self.data["remaining_credits"] = self.data["daily_usage"][latest_date]["remaining"]
+                if self.search_var.get() or self.history_sort[0] == "used_today":
+                    # the next entry's usage changed, which can move it in or out of the search
+                    # results or to another place in the sort order
+                    self.update_history_display()
                 else:
-                    self.data["remaining_credits"] = self.data["total_credits"]
-                
-                self.save_data()
-                self.update_dashboard_display()
-                self.update_history_display()
+                    # drop just that row, rows still on screen are re-checked since the next entry's usage changed
+                    self.history_view.set_rows([d for d in self.history_view.keys if d != date_str])
+                    self.mark_rendered("history")
 
     def add_history_note(self):
         # Get selected item
-        selected = self.history_tree.selection()
+        selected = self.history_view.selection()
         if not selected:
             return
         
-        # Get date from selected item
-        date_str = self.history_tree.item(selected[0], "values")[0]
+        # rows are keyed by date
+        date_str = selected[0]
         
         # Create note dialog
         note_window = tk.Toplevel(self.root)
@@ -1495,8 +1506,7 @@ class PoeTracker:
         note_text.pack(padx=20, fill=tk.X)
         
         # Get existing note if any
-        if "notes" in self.data and date_str in self.data["notes"]:
-            note_text.insert(tk.END, self.data["notes"][date_str])
+        note_text.insert(tk.END, self.store.note(date_str))
         
         # Buttons
         button_frame = tk.Frame(note_window)
@@ -1511,20 +1521,15 @@ class PoeTracker:
         cancel_btn.pack(side=tk.LEFT, padx=5)
 
     def save_history_note(self, date_str, note, window):
-        # Initialize notes dict if it doesn't exist
-        if "notes" not in self.data:
-            self.data["notes"] = {}
+        # Save note, an empty note removes it
+        self.store.set_note(date_str, note)
         
-        # Save note
-        if note:
-            self.data["notes"][date_str] = note
+        if self.search_var.get():
+            # the note can move the row in or out of the search results
+            self.update_history_display()
         else:
-            # Remove note if empty
-            if date_str in self.data["notes"]:
-                del self.data["notes"][date_str]
-        
-        self.save_data()
-        self.update_history_display()
+            self.history_view.refresh_rows([date_str])
+            self.mark_rendered("history")
         window.destroy()
 
     def show_history_context_menu(self, event):
@@ -1568,21 +1573,9 @@ class PoeTracker:
                 writer.writerow(["Date", "Remaining Credits", "Used Today", "Daily Target", "Status", "Note"])
                 
                 # Get daily target
-                next_reset = datetime.strptime(self.data["next_reset"], "%Y-%m-%d")
-                days_in_month = calendar.monthrange(next_reset.year, next_reset.month)[1]
-                daily_target = self.data["total_credits"] / days_in_month
+                daily_target = self.store.daily_target()
                 
-                # Sort dates
-                sorted_dates = sorted(self.data["daily_usage"].keys(), 
-                                     key=lambda x: datetime.strptime(x, "%Y-%m-%d"))
-                
-                for date_str in sorted_dates:
-                    entry = self.data["daily_usage"][date_str]
-                    used = entry.get("used", 0)
-                    
-                    # Get note if exists
-                    note = self.data.get("notes", {}).get(date_str, "")
-                    
+                for date_str, remaining, used, note in self.store.export_rows():
                     # Determine status
                     if used > daily_target * 1.2:
                         status = "Over Budget"
@@ -1593,7 +1586,7 @@ class PoeTracker:
                     
                     writer.writerow([
                         date_str,
-                        entry['remaining'],
+                        remaining,
                         used,
                         f"{daily_target:.2f}",
                         status,
@@ -1606,12 +1599,13 @@ class PoeTracker:
             messagebox.showerror("Export Error", f"An error occurred: {str(e)}")
 
     def update_analytics_display(self):
+        if "analytics" not in self.built_tabs:
+            return
+        self.mark_rendered("analytics")
+        
         chart_type = self.chart_type_var.get()
         time_range = self.chart_range_var.get()
         
-        # Clear figure
-        self.analytics_fig.clear()
-        
         # Get date range
         today = datetime.now().date()
         
@@ -1633,301 +1627,104 @@ class PoeTracker:
             start_date = today - timedelta(days=89)
             end_date = today
         else:  # All Time
-            if self.data["daily_usage"]:
-                earliest_date = min(datetime.strptime(d, "%Y-%m-%d").date() for d in self.data["daily_usage"].keys())
+            earliest_date = self.store.earliest_date()
+            if earliest_date:
                 start_date = earliest_date
                 end_date = today
             else:
                 start_date = today - timedelta(days=30)
                 end_date = today
         
+        # a chart already drawn for this data, day, theme and canvas size is shown as is
+        width, height = self.analytics_size()
+        scope = (self.store.version, today, self.data["theme"])
+        key = (chart_type, time_range, width, height)
+        render = self.chart_cache.get(scope, key)
+        if render is not None:
+            self.chart_renderer.cancel()
+            self.analytics_pending = None
+            self.show_analytics_image(render.image)
+            self.update_analytics_stats(render.stats, render.daily_target)
+            return
+        if self.analytics_pending == (scope, key):
+            # already being drawn
+            return
+        
         # Get daily target
-        next_reset = datetime.strptime(self.data["next_reset"], "%Y-%m-%d")
-        days_in_month = calendar.monthrange(next_reset.year, next_reset.month)[1]
-        daily_target = self.data["total_credits"] / days_in_month
+        daily_target = self.store.daily_target()
         
         # Prepare data
-        dates = []
-        usage_data = []
-        remaining_data = []
-        
-        # Create date range
-        current_date = start_date
-        while current_date <= end_date:
-            date_str = current_date.strftime("%Y-%m-%d")
-            dates.append(current_date)
-            
-            if date_str in self.data["daily_usage"]:
-                entry = self.data["daily_usage"][date_str]
-                usage_data.append(entry.get("used", 0))
-                remaining_data.append(entry["remaining"])
-            else:
-                usage_data.append(0)
-                
-                # For remaining, use the last known value or total
-                if remaining_data:
-                    remaining_data.append(remaining_data[-1])
-                elif current_date > start_date:
-                    # Look for earlier entries
-                    prev_date = current_date - timedelta(days=1)
-                    while prev_date >= start_date:
-                        prev_str = prev_date.strftime("%Y-%m-%d")
-                        if prev_str in self.data["daily_usage"]:
-                            remaining_data.append(self.data["daily_usage"][prev_str]["remaining"])
-                            break
-                        prev_date -= timedelta(days=1)
-                    else:
-                        remaining_data.append(self.data["total_credits"])
-                else:
-                    remaining_data.append(self.data["total_credits"])
-            
-            current_date += timedelta(days=1)
-        
-        # Create appropriate chart based on selection
+        series = self.store.usage_series(start_date, end_date)
+        dates, usage_data, remaining_data = series
+        
+        # Update statistics right away, the chart follows when the renderer is done
+        stats = self.store.series_stats(series, today)
+        self.update_analytics_stats(stats, daily_target)
+        
+        # Create appropriate chart based on selection, everything it needs from the store is
+        # read here since drawing happens on the renderer's thread
+        colors = self.colors
+        if chart_type in ("Daily Usage", "Usage vs Target"):
+            # long ranges may be grouped by billing period, these are where they start
+            period_starts = [period.start for period in self.store.periods_between(start_date, end_date)]
         if chart_type == "Daily Usage":
-            self.create_daily_usage_chart(dates, usage_data, daily_target)
+            draw = lambda fig: draw_daily_usage(fig, colors, dates, usage_data, daily_target, period_starts)
         elif chart_type == "Usage vs Target":
-            self.create_usage_vs_target_chart(dates, usage_data, daily_target)
+            draw = lambda fig: draw_usage_vs_target(fig, colors, dates, usage_data, daily_target, period_starts)
         elif chart_type == "Remaining Credits":
-            self.create_remaining_credits_chart(dates, remaining_data)
-        elif chart_type == "Usage Heatmap":
-            self.create_usage_heatmap(dates, usage_data, daily_target)
-        
-        # Update canvas
-        self.analytics_canvas.draw()
-        
-        # Update statistics
-        self.update_analytics_stats(dates, usage_data, remaining_data, daily_target)
+            ideal_remaining = self.ideal_remaining(dates)
+            draw = lambda fig: draw_remaining_credits(fig, colors, dates, remaining_data, ideal_remaining)
+        else:  # Usage Heatmap
+            draw = lambda fig: draw_usage_heatmap(fig, dates, usage_data, daily_target)
+        
+        def done(image):
+            self.analytics_pending = None
+            self.chart_cache.put(scope, key, ChartRender(image, stats, daily_target))
+            self.show_analytics_image(image)
+        
+        def failed(error):
+            self.analytics_pending = None
+            self.analytics_view.itemconfig(self.analytics_status, text=f"Chart error: {error}")
+        
+        # the old chart stays up until the new one is ready; a newer request drops this one
+        self.analytics_pending = (scope, key)
+        self.analytics_view.itemconfig(self.analytics_status, text="Rendering...")
+        self.analytics_view.tag_raise(self.analytics_status)
+        self.chart_renderer.submit(draw, width, height, done, failed)
 
-    def create_daily_usage_chart(self, dates, usage_data, daily_target):
-        ax = self.analytics_fig.add_subplot(111)
-        
-        # Create bar colors based on usage vs target
-        bar_colors = []
-        for usage in usage_data:
-            if usage > daily_target * 1.2:
-                bar_colors.append(self.colors["danger"])
-            elif usage > daily_target:
-                bar_colors.append(self.colors["warning"])
-            else:
-                bar_colors.append(self.colors["good"])
-        
-        # Plot bars
-        bars = ax.bar([d.strftime("%m/%d") for d in dates], usage_data, color=bar_colors, alpha=0.8)
-        
-        # Add target line
-        ax.axhline(y=daily_target, color='r', linestyle='--', alpha=0.7, label='Daily Target')
-        
-        # Add labels and title
-        ax.set_xlabel('Date')
-        ax.set_ylabel('Credits Used')
-        ax.set_title('Daily Credit Usage')
-        
-        # Add legend
-        ax.legend()
-        
-        # Rotate x-axis labels for better readability
-        if len(dates) > 10:
-            # Show fewer x-ticks for readability
-            step = max(1, len(dates) // 10)
-            ax.set_xticks([d.strftime("%m/%d") for d in dates[::step]])
-            ax.set_xticklabels([d.strftime("%m/%d") for d in dates[::step]], rotation=45, ha='right')
-        else:
-            ax.set_xticklabels([d.strftime("%m/%d") for d in dates], rotation=45, ha='right')
-        
-        # Adjust layout
-        self.analytics_fig.tight_layout()
-
-    def create_usage_vs_target_chart(self, dates, usage_data, daily_target):
-        ax = self.analytics_fig.add_subplot(111)
-        
-        # Calculate cumulative usage
-        cumulative_usage = np.cumsum(usage_data)
-        
-        # Calculate ideal usage line
-        ideal_usage = [daily_target * (i+1) for i in range(len(dates))]
-        
-        # Plot lines
-        ax.plot([d.strftime("%m/%d") for d in dates], cumulative_usage, 'b-', marker='o', 
-               linewidth=2, label='Actual Usage')
-        ax.plot([d.strftime("%m/%d") for d in dates], ideal_usage, 'r--', 
-               linewidth=2, label='Target Usage')
-        
-        # Fill between
-        ax.fill_between([d.strftime("%m/%d") for d in dates], cumulative_usage, ideal_usage, 
-                       where=np.array(cumulative_usage) > np.array(ideal_usage), 
-                       color=self.colors["danger"], alpha=0.3, interpolate=True)
-        ax.fill_between([d.strftime("%m/%d") for d in dates], cumulative_usage, ideal_usage, 
-                       where=np.array(cumulative_usage) <= np.array(ideal_usage), 
-                       color=self.colors["good"], alpha=0.3, interpolate=True)
-        
-        # Add labels and title
-        ax.set_xlabel('Date')
-        ax.set_ylabel('Cumulative Credits Used')
-        ax.set_title('Cumulative Usage vs Target')
-        
-        # Add legend
-        ax.legend()
-        
-        # Rotate x-axis labels for better readability
-        if len(dates) > 10:
-            # Show fewer x-ticks for readability
-            step = max(1, len(dates) // 10)
-            ax.set_xticks([d.strftime("%m/%d") for d in dates[::step]])
-            ax.set_xticklabels([d.strftime("%m/%d") for d in dates[::step]], rotation=45, ha='right')
-        else:
-            ax.set_xticklabels([d.strftime("%m/%d") for d in dates], rotation=45, ha='right')
-        
-        # Adjust layout
-        self.analytics_fig.tight_layout()
-
-    def create_remaining_credits_chart(self, dates, remaining_data):
-        ax = self.analytics_fig.add_subplot(111)
-        
-        # Plot line
-        ax.plot([d.strftime("%m/%d") for d in dates], remaining_data, 'b-', marker='o', 
-               linewidth=2, label='Remaining Credits')
-        
-        # Add ideal remaining line
+    def ideal_remaining(self, dates):
+        # ideal remaining credits for each day, restarting at every reset in the range
         total_credits = self.data["total_credits"]
-        days_total = (datetime.strptime(self.data["next_reset"], "%Y-%m-%d").date() - 
-                     datetime.strptime(self.data["next_reset"], "%Y-%m-%d").replace(day=1).date()).days + 1
-        
         ideal_remaining = []
-        for i, date in enumerate(dates):
-            days_passed = (date - datetime.strptime(self.data["next_reset"], "%Y-%m-%d").replace(day=1).date()).days
-            if days_passed < 0:
-                ideal_remaining.append(total_credits)
-            else:
-                ideal_remaining.append(total_credits - (total_credits / days_total) * days_passed)
-        
-        ax.plot([d.strftime("%m/%d") for d in dates], ideal_remaining, 'r--', 
-               linewidth=2, label='Ideal Remaining')
-        
-        # Fill between
-        ax.fill_between([d.strftime("%m/%d") for d in dates], remaining_data, ideal_remaining, 
-                       where=np.array(remaining_data) < np.array(ideal_remaining), 
-                       color=self.colors["danger"], alpha=0.3, interpolate=True)
-        ax.fill_between([d.strftime("%m/%d") for d in dates], remaining_data, ideal_remaining, 
-                       where=np.array(remaining_data) >= np.array(ideal_remaining), 
-                       color=self.colors["good"], alpha=0.3, interpolate=True)
-        
-        # Add labels and title
-        ax.set_xlabel('Date')
-        ax.set_ylabel('Remaining Credits')
-        ax.set_title('Remaining Credits Over Time')
-        
-        # Add legend
-        ax.legend()
-        
-        # Rotate x-axis labels for better readability
-        if len(dates) > 10:
-            # Show fewer x-ticks for readability
-            step = max(1, len(dates) // 10)
-            ax.set_xticks([d.strftime("%m/%d") for d in dates[::step]])
-            ax.set_xticklabels([d.strftime("%m/%d") for d in dates[::step]], rotation=45, ha='right')
-        else:
-            ax.set_xticklabels([d.strftime("%m/%d") for d in dates], rotation=45, ha='right')
-        
-        # Adjust layout
-        self.analytics_fig.tight_layout()
-
-    def create_usage_heatmap(self, dates, usage_data, daily_target):
-        # Create month-based heatmap
-        if not dates:
-            # No data to display
-            ax = self.analytics_fig.add_subplot(111)
-            ax.text(0.5, 0.5, "No data available for selected period", 
-                   horizontalalignment='center', verticalalignment='center')
-            return
-        
-        # Group data by month and day
-        month_data = {}
-        for i, date in enumerate(dates):
-            month_key = date.strftime("%Y-%m")
-            day = date.day
-            
-            if month_key not in month_data:
-                month_data[month_key] = {}
-            
-            month_data[month_key][day] = usage_data[i]
-        
-        # Sort months
-        sorted_months = sorted(month_data.keys())
-        
-        # Create a grid of subplots
-        rows = (len(sorted_months) + 2) // 3  # 3 months per row
-        cols = min(3, len(sorted_months))
-        
-        # Create figure with subplots
-        for i, month_key in enumerate(sorted_months):
-            ax = self.analytics_fig.add_subplot(rows, cols, i+1)
-            
-            # Get month data
-            month_dict = month_data[month_key]
-            
-            # Create calendar grid
-            year, month = map(int, month_key.split('-'))
-            _, days_in_month = calendar.monthrange(year, month)
-            
-            first_day = datetime(year, month, 1).weekday()  # 0 = Monday, 6 = Sunday
-            
-            # Create 7x6 grid (weekdays x weeks)
-            data = np.zeros((6, 7))
-            data.fill(np.nan)  # Fill with NaN for empty cells
-            
-            # Fill in the data
-            day = 1
-            for week in range(6):
-                for weekday in range(7):
-                    if (week == 0 and weekday < first_day) or day > days_in_month:
-                        continue
-                    
-                    if day in month_dict:
-                        # Normalize by daily target for color coding
-                        data[week, weekday] = month_dict[day] / daily_target
-                    else:
-                        data[week, weekday] = 0
-                    
-                    day += 1
-            
-            # Create heatmap
-            cmap = plt.cm.RdYlGn_r  # Red for high usage, green for low
-            im = ax.imshow(data, cmap=cmap, vmin=0, vmax=2)
-            
-            # Add day numbers to cells
-            day = 1
-            for week in range(6):
-                for weekday in range(7):
-                    if (week == 0 and weekday < first_day) or day > days_in_month:
-                        day_text = ""
-                    else:
-                        day_text = str(day)
-                        day += 1
-                    
-                    ax.text(weekday, week, day_text, ha='center', va='center', 
-                           color='black' if not np.isnan(data[week, weekday]) and data[week, weekday] < 1.5 else 'white')
-            
-            # Set title and labels
-            ax.set_title(datetime(year, month, 1).strftime("%B %Y"))
-            ax.set_xticks(range(7))
-            ax.set_xticklabels(['M', 'T', 'W', 'T', 'F', 'S', 'S'])
-            ax.set_yticks([])
-            
-            # Remove axis
-            for spine in ax.spines.values():
-                spine.set_visible(False)
-        
-        # Add colorbar
-        cbar_ax = self.analytics_fig.add_axes([0.92, 0.15, 0.02, 0.7])
-        cbar = self.analytics_fig.colorbar(im, cax=cbar_ax)
-        cbar.set_label('Usage Ratio (Actual/Target)')
-        
-        # Adjust layout
-        self.analytics_fig.tight_layout(rect=[0, 0, 0.9, 1])
+        for date in dates:
+            period = self.store.period_for(date)
+            ideal_remaining.append(total_credits - period.ideal_usage_curve()[(date - period.start).days])
+        return ideal_remaining
+
+    def analytics_size(self):
+        # the chart canvas size once laid out, its requested size before that
+        view = self.analytics_view
+        if not view.winfo_ismapped():
+            view.update_idletasks()
+        width, height = view.winfo_width(), view.winfo_height()
+        if width <= 1 or height <= 1:
+            return int(view["width"]), int(view["height"])
+        return width, height
+
+    def show_analytics_image(self, image):
+        # keep a reference, Tk drops images that Python garbage collects
+        self.analytics_photo = tk.PhotoImage(data=image, format="PPM")
+        self.analytics_view.itemconfig(self.analytics_image, image=self.analytics_photo)
+        self.analytics_view.itemconfig(self.analytics_status, text="")
+
+    def on_analytics_resize(self, event):
+        # redraw at the new size once resizing settles
+        if self.analytics_resize_job:
+            self.root.after_cancel(self.analytics_resize_job)
+        self.analytics_resize_job = self.root.after(150, self.update_analytics_display)
 
-    def update_analytics_stats(self, dates, usage_data, remaining_data, daily_target):
-        if not usage_data:
+    def update_analytics_stats(self, stats, daily_target):
+        if stats.remaining is None:
             # No data to analyze
             self.analytics_total_used.config(text="No data")
             self.analytics_avg_daily.config(text="No data")
@@ -1940,72 +1737,37 @@ class PoeTracker:
             self.analytics_recommended.config(text="No data")
             return
         
-        # Calculate statistics
-        total_used = sum(usage_data)
-        self.analytics_total_used.config(text=f"{total_used:,}")
+        self.analytics_total_used.config(text=f"{stats.total_used:,}")
+        self.analytics_avg_daily.config(text=f"{stats.average_daily or 0:,.2f}")
         
-        avg_daily = total_used / len([u for u in usage_data if u > 0]) if any(usage_data) else 0
-        self.analytics_avg_daily.config(text=f"{avg_daily:,.2f}")
-        
-        # Find highest and lowest usage days
-        if any(usage_data):
-            max_index = usage_data.index(max(usage_data))
-            min_index = next((i for i, u in enumerate(usage_data) if u > 0), 0)
-            for i, u in enumerate(usage_data):
-                if u > 0 and u < usage_data[min_index]:
-                    min_index = i
-            
+        # Highest and lowest usage days
+        if stats.highest_day:
             self.analytics_highest_day.config(
-                text=f"{dates[max_index].strftime('%Y-%m-%d')} ({usage_data[max_index]:,})")
+                text=f"{stats.highest_day.strftime('%Y-%m-%d')} ({stats.highest_usage:,})")
             self.analytics_lowest_day.config(
-                text=f"{dates[min_index].strftime('%Y-%m-%d')} ({usage_data[min_index]:,})")
+                text=f"{stats.lowest_day.strftime('%Y-%m-%d')} ({stats.lowest_usage:,})")
         else:
             self.analytics_highest_day.config(text="No usage data")
             self.analytics_lowest_day.config(text="No usage data")
         
-        # Count days over/under target
-        days_over = sum(1 for u in usage_data if u > daily_target)
-        days_under = sum(1 for u in usage_data if 0 < u <= daily_target)
-        
-        self.analytics_over_target.config(text=str(days_over))
-        self.analytics_under_target.config(text=str(days_under))
+        self.analytics_over_target.config(text=str(stats.days_over))
+        self.analytics_under_target.config(text=str(stats.days_under))
         
-        # Calculate projections
-        if remaining_data:
-            # Get days until reset
-            today = datetime.now().date()
-            next_reset = datetime.strptime(self.data["next_reset"], "%Y-%m-%d").date()
-            days_until_reset = (next_reset - today).days
-            
-            if days_until_reset > 0:
-                # Calculate recent average daily usage (last 7 days or all if less)
-                recent_usage = [u for u in usage_data[-7:] if u > 0]
-                if recent_usage:
-                    recent_avg = sum(recent_usage) / len(recent_usage)
-                    projected_usage = recent_avg * days_until_reset
-                    projected_remaining = remaining_data[-1] - projected_usage
-                    
-                    if projected_remaining < 0:
-                        projected_remaining = 0
-                    
-                    self.analytics_projected_eom.config(text=f"{projected_remaining:,.0f}")
-                    self.analytics_projected_usage.config(text=f"{(total_used + projected_usage):,.0f}")
-                    
-                    # Calculate recommended daily limit
-                    recommended = remaining_data[-1] / days_until_reset
-                    self.analytics_recommended.config(text=f"{recommended:,.2f}")
-                else:
-                    self.analytics_projected_eom.config(text="Insufficient data")
-                    self.analytics_projected_usage.config(text="Insufficient data")
-                    self.analytics_recommended.config(text=f"{daily_target:,.2f}")
+        # Projections
+        if stats.days_until_reset > 0:
+            if stats.recent_average is not None:
+                self.analytics_projected_eom.config(text=f"{stats.projected_remaining:,.0f}")
+                self.analytics_projected_usage.config(
+                    text=f"{(stats.total_used + stats.projected_usage):,.0f}")
+                self.analytics_recommended.config(text=f"{stats.recommended_daily:,.2f}")
             else:
-                self.analytics_projected_eom.config(text=f"{remaining_data[-1]:,.0f}")
-                self.analytics_projected_usage.config(text=f"{total_used:,.0f}")
-                self.analytics_recommended.config(text="Reset day reached")
+                self.analytics_projected_eom.config(text="Insufficient data")
+                self.analytics_projected_usage.config(text="Insufficient data")
+                self.analytics_recommended.config(text=f"{daily_target:,.2f}")
         else:
-            self.analytics_projected_eom.config(text="No data")
-            self.analytics_projected_usage.config(text="No data")
-            self.analytics_recommended.config(text="No data")
+            self.analytics_projected_eom.config(text=f"{stats.remaining:,.0f}")
+            self.analytics_projected_usage.config(text=f"{stats.total_used:,.0f}")
+            self.analytics_recommended.config(text="Reset day reached")
 
     def update_usage(self):
         try:
@@ -2013,47 +1775,8 @@ class PoeTracker:
             remaining = int(self.remaining_entry_var.get().replace(',', ''))
             note = self.note_entry_var.get().strip()
             
-            # Validate date format
-            date = datetime.strptime(date_str, "%Y-%m-%d")
-            
-            # Calculate usage
-            if date_str not in self.data["daily_usage"]:
-                # First entry of the day
-                prev_date = self.get_previous_date(date_str)
-                if prev_date:
-                    prev_remaining = self.data["daily_usage"][prev_date]["remaining"]
-                    used_today = prev_remaining - remaining
-                else:
-                    # No previous data, assume starting from total
-                    used_today = self.data["total_credits"] - remaining
-            else:
-                # Update existing entry
-                prev_date = self.get_previous_date(date_str)
-                if prev_date:
-                    prev_remaining = self.data["daily_usage"][prev_date]["remaining"]
-                    used_today = prev_remaining - remaining
-                else:
-                    # No previous data, calculate from total
-                    used_today = self.data["total_credits"] - remaining
-            
-            # Update data
-            self.data["daily_usage"][date_str] = {
-                "remaining": remaining,
-                "used": used_today,
-                "date": date_str
-            }
-            
-            self.data["remaining_credits"] = remaining
-            self.data["last_updated"] = date_str
-            
-            # Save note if provided
-            if note:
-                if "notes" not in self.data:
-                    self.data["notes"] = {}
-                self.data["notes"][date_str] = note
-            
-            # Save and update display
-            self.save_data()
+            # Save and update display (the store validates the date format)
+            self.store.record_usage(date_str, remaining, note)
             self.update_dashboard_display()
             
             # Clear note field
@@ -2064,58 +1787,6 @@ class PoeTracker:
         except ValueError as e:
             messagebox.showerror("Input Error", "Please enter valid date (YYYY-MM-DD) and numeric values for credits")
 
-    def get_previous_date(self, date_str):
-        date = datetime.strptime(date_str, "%Y-%m-%d")
-        prev_date = date - timedelta(days=1)
-        prev_date_str = prev_date.strftime("%Y-%m-%d")
-        
-        if prev_date_str in self.data["daily_usage"]:
-            return prev_date_str
-        
-        # If no direct previous day, find the most recent date before this one
-        dates = sorted([d for d in self.data["daily_usage"].keys() 
-                       if datetime.strptime(d, "%Y-%m-%d") < date])
-        
-        if dates:
-            return dates[-1]  # Return the most recent date
-        
-        return None
-
-    def calculate_ideal_usage(self, current_date):
-        # Calculate how much should have been used by current date
-        reset_day = self.data["reset_day"]
-        
-        # Get the start of the current period
-        if current_date.day < reset_day:
-            # We're before the reset day, so the period started in the previous month
-            if current_date.month == 1:
-                period_start = datetime(current_date.year - 1, 12, reset_day)
-            else:
-                period_start = datetime(current_date.year, current_date.month - 1, reset_day)
-        else:
-            # We're after the reset day, so the period started this month
-            period_start = datetime(current_date.year, current_date.month, reset_day)
-        
-        # Calculate days passed in the period
-        days_passed = (current_date - period_start.date()).days
-        
-        # Calculate next reset date
-        if current_date.day < reset_day:
-            next_reset = datetime(current_date.year, current_date.month, reset_day)
-        else:
-            if current_date.month == 12:
-                next_reset = datetime(current_date.year + 1, 1, reset_day)
-            else:
-                next_reset = datetime(current_date.year, current_date.month + 1, reset_day)
-        
-        # Calculate total days in period
-        total_days = (next_reset.date() - period_start.date()).days
-        
-        # Calculate ideal usage
-        ideal_usage = (self.data["total_credits"] / total_days) * days_passed
-        
-        return ideal_usage
-
     def get_usage_status(self, extra_available, daily_target):
         if extra_available < -daily_target * 5:
             return "Critical", self.colors["danger"]
@@ -2127,6 +1798,8 @@ class PoeTracker:
             return "Under Budget", "#3f51b5"  # Indigo
 
     def show_calendar_picker(self):
+        from tkcalendar import Calendar
+        
         # Create a toplevel window
         top = tk.Toplevel(self.root)
         top.title("Select Date")
@@ -2172,28 +1845,16 @@ class PoeTracker:
                 messagebox.showerror("Input Error", "Low credit threshold must be between 0 and 100")
                 return
             
-            # Update data
-            self.data["total_credits"] = total_credits
-            self.data["reset_day"] = reset_day
-            self.data["low_credit_threshold"] = threshold
-            self.data["theme"] = self.theme_var.get()
-            self.data["show_projections"] = self.show_projections_var.get()
-            self.data["notifications"] = self.notifications_var.get()
-            
-            # Recalculate next reset date
-            today = datetime.now()
-            if today.day <= reset_day:
-                next_reset = datetime(today.year, today.month, reset_day)
-            else:
-                if today.month == 12:
-                    next_reset = datetime(today.year + 1, 1, reset_day)
-                else:
-                    next_reset = datetime(today.year, today.month + 1, reset_day)
-            
-            self.data["next_reset"] = next_reset.strftime("%Y-%m-%d")
-            
-            # Save and update display
-            self.save_data()
+            # Update data, the store recalculates the next reset date
+            self.store.update_settings(
+                total_credits=total_credits,
+                reset_day=reset_day,
+                low_credit_threshold=threshold,
+                theme=self.theme_var.get(),
+                show_projections=self.show_projections_var.get(),
+                notifications=self.notifications_var.get()
+            )
+            self.store.switch_storage(self.storage_var.get())
             self.update_dashboard_display()
             
             # Apply theme changes
@@ -2241,44 +1902,7 @@ class PoeTracker:
 
     def reset_data(self):
         # Keep settings but reset usage data
-        today = datetime.now()
-        reset_day = self.data["reset_day"]
-        
-        # Calculate next reset date
-        if today.day <= reset_day:
-            next_reset = datetime(today.year, today.month, reset_day)
-        else:
-            if today.month == 12:
-                next_reset = datetime(today.year + 1, 1, reset_day)
-            else:
-                next_reset = datetime(today.year, today.month + 1, reset_day)
-        
-        # Save settings before reset
-        settings = {
-            "total_credits": self.data["total_credits"],
-            "reset_day": reset_day,
-            "theme": self.data.get("theme", "light"),
-            "show_projections": self.data.get("show_projections", True),
-            "notifications": self.data.get("notifications", True),
-            "low_credit_threshold": self.data.get("low_credit_threshold", 20)
-        }
-        
-        # Reset data
-        self.data = {
-            "total_credits": settings["total_credits"],
-            "remaining_credits": settings["total_credits"],
-            "reset_day": settings["reset_day"],
-            "next_reset": next_reset.strftime("%Y-%m-%d"),
-            "daily_usage": {},
-            "last_updated": today.strftime("%Y-%m-%d"),
-            "theme": settings["theme"],
-            "show_projections": settings["show_projections"],
-            "notifications": settings["notifications"],
-            "low_credit_threshold": settings["low_credit_threshold"],
-            "notes": {}
-        }
-        
-        self.save_data()
+        self.store.reset()
         self.update_dashboard_display()
         self.update_calendar_display()
         
@@ -2286,7 +1910,6 @@ class PoeTracker:
 
     def backup_data(self):
         from tkinter import filedialog
-        import shutil
         
         # Ask for backup location
         backup_path = filedialog.asksaveasfilename(
@@ -2299,15 +1922,14 @@ class PoeTracker:
             return
         
         try:
-            # Copy the data file to backup location
-            shutil.copy2(self.data_file, backup_path)
+            # Write the current data as a JSON snapshot, whatever the storage backend
+            write_snapshot(backup_path, self.data)
             messagebox.showinfo("Backup Successful", f"Data backed up to {backup_path}")
         except Exception as e:
             messagebox.showerror("Backup Error", f"An error occurred: {str(e)}")
 
     def restore_data(self):
         from tkinter import filedialog
-        import shutil
         
         # Ask for backup file
         backup_path = filedialog.askopenfilename(
@@ -2331,11 +1953,8 @@ class PoeTracker:
             
             # Confirm restore
             if messagebox.askyesno("Confirm Restore", "This will overwrite your current data. Continue?"):
-                # Copy the backup file to data file location
-                shutil.copy2(backup_path, self.data_file)
-                
-                # Reload data
-                self.load_data()
+                # Replace the stored data with the backup and reload
+                self.store.restore(backup_data)
                 self.update_dashboard_display()
                 self.update_calendar_display()
                 
@@ -2364,20 +1983,11 @@ class PoeTracker:
                 # Write header
                 writer.writerow(["Date", "Remaining Credits", "Used Today", "Note"])
                 
-                # Sort dates
-                sorted_dates = sorted(self.data["daily_usage"].keys(), 
-                                     key=lambda x: datetime.strptime(x, "%Y-%m-%d"))
-                
-                for date_str in sorted_dates:
-                    entry = self.data["daily_usage"][date_str]
-                    used = entry.get("used", 0)
-                    
-                    # Get note if exists
-                    note = self.data.get("notes", {}).get(date_str, "")
-                    
+                # Oldest first
+                for date_str, remaining, used, note in self.store.export_rows():
                     writer.writerow([
                         date_str,
-                        entry['remaining'],
+                        remaining,
                         used,
                         note
                     ])
@@ -2412,39 +2022,10 @@ class PoeTracker:
                 # Skip header
                 next(reader)
                 
-                # Initialize notes dict if it doesn't exist
-                if "notes" not in self.data:
-                    self.data["notes"] = {}
-                
-                # Read data
-                for row in reader:
-                    if len(row) >= 3:
-                        date_str = row[0]
-                        try:
-                            remaining = int(row[1])
-                            used = int(row[2])
-                            
-                            # Add to data
-                            self.data["daily_usage"][date_str] = {
-                                "remaining": remaining,
-                                "used": used,
-                                "date": date_str
-                            }
-                            
-                            # Add note if exists
-                            if len(row) >= 4 and row[3]:
-                                self.data["notes"][date_str] = row[3]
-                            
-                            # Update remaining credits if this is the latest entry
-                            latest_date = max(self.data["daily_usage"].keys()) if self.data["daily_usage"] else None
-                            if latest_date == date_str:
-                                self.data["remaining_credits"] = remaining
-                                
-                        except ValueError:
-                            continue
+                # Read all rows, bad rows are skipped and the store writes one snapshot
+                self.store.import_rows(reader)
             
-            # Save and update displays
-            self.save_data()
+            # Update displays
             self.update_dashboard_display()
             self.update_calendar_display()
             
@@ -0,0 +1,334 @@
+# poe_widgets.py
+import calendar
+import tkinter as tk
+from collections import namedtuple
+from datetime import date
+from tkinter import ttk
+
+# one calendar cell: date string (None for padding), day number text, usage text, fill and day number colors
+DayCell = namedtuple("DayCell", ["date", "day", "usage", "fill", "color"])
+EMPTY_CELL = DayCell(None, "", "", "white", "black")
+
+
+class VirtualTreeview:
+    # a Treeview that only holds the rows in view; the full result set is a list of keys kept here
+    # and rows are formatted on demand as they scroll in. Rendering diffs against what is already
+    # on screen, so Tk only hears about rows that were added, moved, changed or removed
+    default_row_height = 20
+
+    def __init__(self, parent, columns, format_row, buffer=2, **tree_options):
+        self.format_row = format_row
+        self.buffer = buffer
+        self.keys = []
+        # key -> values of the rows currently in the tree, and their on-screen order
+        self.rendered = {}
+        self.rendered_order = []
+        self.top = 0
+        self.visible_rows = tree_options.get("height", 10)
+        self.selected_key = None
+        # widget height from the last resize, and whether the row height came from a rendered row
+        self.height = None
+        self.measured = False
+
+        self.tree = ttk.Treeview(parent, columns=columns, selectmode="browse", **tree_options)
+        self.scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self.yview)
+
+        self.tree.bind("<Configure>", self.on_resize)
+        self.tree.bind("<<TreeviewSelect>>", self.on_select, add="+")
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(sequence, self.on_wheel)
+        for sequence in ("<Up>", "<Down>", "<Prior>", "<Next>", "<Home>", "<End>"):
+            self.tree.bind(sequence, self.on_key)
+
+    # ---- contents ----
+
+    def set_rows(self, keys):
+        # replace the result set, keeping the scroll position and selection where they still make sense;
+        # rows that stay on screen are re-formatted since their data may have changed
+        self.keys = list(keys)
+        if self.selected_key is not None and self.selected_key not in self.keys:
+            self.selected_key = None
+        self.top = min(self.top, self.max_top())
+        self.render(refresh=True)
+
+    def refresh_rows(self, keys):
+        # re-format specific rows in place, only those that are on screen and actually changed
+        for key in keys:
+            if key in self.rendered:
+                values = self.format_row(key)
+                if values != self.rendered[key]:
+                    self.rendered[key] = values
+                    self.tree.item(key, values=values)
+
+    def render(self, refresh=False):
+        window = self.keys[self.top:self.top + self.visible_rows + self.buffer]
+        wanted = set(window)
+
+        stale = [key for key in self.rendered_order if key not in wanted]
+        if stale:
+            self.tree.delete(*stale)
+            for key in stale:
+                del self.rendered[key]
+            self.rendered_order = [key for key in self.rendered_order if key in wanted]
+
+        if refresh:
+            self.refresh_rows(self.rendered_order)
+
+        # walk the window in order, inserting new rows and moving kept ones that are out of place
+        order = self.rendered_order
+        for index, key in enumerate(window):
+            if index < len(order) and order[index] == key:
+                continue
+            if key in self.rendered:
+                order.remove(key)
+                self.tree.move(key, "", index)
+            else:
+                self.rendered[key] = self.format_row(key)
+                self.tree.insert("", index, iid=key, values=self.rendered[key])
+                if key == self.selected_key:
+                    self.tree.selection_set(key)
+                    self.tree.focus(key)
+            order.insert(index, key)
+
+        self.update_scrollbar()
+        if order and not self.measured and self.height is not None:
+            # the first rows are in, fit the window to their real height once they are laid out
+            self.tree.after_idle(self.fit_rows)
+
+    def selection(self):
+        # the selected key even when its row is scrolled out of view
+        return (self.selected_key,) if self.selected_key is not None else ()
+
+    # ---- scrolling ----
+
+    def max_top(self):
+        return max(len(self.keys) - self.visible_rows, 0)
+
+    def scroll_to(self, top):
+        top = min(max(top, 0), self.max_top())
+        if top != self.top:
+            self.top = top
+            self.render()
+
+    def see(self, index):
+        # scroll just enough to bring the row at index into view
+        if index < self.top:
+            self.scroll_to(index)
+        elif index >= self.top + self.visible_rows:
+            self.scroll_to(index - self.visible_rows + 1)
+
+    def yview(self, *args):
+        # scrollbar protocol: ("moveto", fraction) or ("scroll", count, "units" | "pages")
+        if args[0] == "moveto":
+            self.scroll_to(round(float(args[1]) * len(self.keys)))
+        elif args[0] == "scroll":
+            step = self.visible_rows if args[2] == "pages" else 1
+            self.scroll_to(self.top + int(args[1]) * step)
+
+    def update_scrollbar(self):
+        if not self.keys:
+            self.scrollbar.set(0, 1)
+            return
+        total = len(self.keys)
+        self.scrollbar.set(self.top / total, min(self.top + self.visible_rows, total) / total)
+
+    # ---- events ----
+
+    def on_resize(self, event):
+        self.height = event.height
+        self.fit_rows()
+
+    def fit_rows(self):
+        # measure from a rendered row when there is one, the heading sits above the first row;
+        # until then take the row height from the style and assume a heading of the same height
+        children = self.tree.get_children()
+        bbox = self.tree.bbox(children[0]) if children else ""
+        if bbox:
+            header, row_height = bbox[1], bbox[3]
+            self.measured = True
+        else:
+            style = self.tree.cget("style") or "Treeview"
+            row_height = int(ttk.Style(self.tree).lookup(style, "rowheight") or self.default_row_height)
+            header = row_height
+
+        visible_rows = max((self.height - header) // row_height, 1)
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            self.top = min(self.top, self.max_top())
+            self.render()
+
+    def on_select(self, event):
+        selection = self.tree.selection()
+        if selection:
+            self.selected_key = selection[0]
+
+    def on_wheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self.scroll_to(self.top - 3)
+        else:
+            self.scroll_to(self.top + 3)
+        return "break"
+
+    def on_key(self, event):
+        # move the selection through the whole result set, not just the rendered rows
+        if not self.keys:
+            return "break"
+        if self.selected_key is None:
+            index = self.top
+        else:
+            index = self.keys.index(self.selected_key)
+            moves = {"Up": -1, "Down": 1, "Prior": -self.visible_rows, "Next": self.visible_rows,
+                     "Home": -len(self.keys), "End": len(self.keys)}
+            index = min(max(index + moves[event.keysym], 0), len(self.keys) - 1)
+
+        self.selected_key = self.keys[index]
+        self.see(index)
+        if self.selected_key in self.rendered:
+            self.tree.selection_set(self.selected_key)
+            self.tree.focus(self.selected_key)
+        return "break"
+
+
+class MonthCanvas:
+    # a month grid drawn on one canvas: a weekday header and 6x7 day cells, each a rectangle with two
+    # text items. show() takes 42 DayCells and only reconfigures the items whose cell changed, and a
+    # single click handler maps coordinates back to a date
+    header_height = 24
+    weekdays = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+    def __init__(self, parent, on_select, header_color, background="white", width=700, height=504):
+        self.on_select = on_select
+        self.canvas = tk.Canvas(parent, width=width, height=height, bg=background, highlightthickness=0)
+        self.cells = [None] * 42
+
+        self.headers = []
+        for name in self.weekdays:
+            rect = self.canvas.create_rectangle(0, 0, 0, 0, fill=header_color, outline=background)
+            text = self.canvas.create_text(0, 0, text=name, fill="white", font=("Arial", 10, "bold"))
+            self.headers.append((rect, text))
+
+        self.items = []
+        for _ in range(42):
+            rect = self.canvas.create_rectangle(0, 0, 0, 0, fill="white", outline="black")
+            day = self.canvas.create_text(0, 0, anchor="nw", font=("Arial", 10, "bold"))
+            usage = self.canvas.create_text(0, 0, anchor="nw", font=("Arial", 9))
+            self.items.append((rect, day, usage))
+
+        self.layout(width, height)
+        self.canvas.bind("<Configure>", lambda e: self.layout(e.width, e.height))
+        self.canvas.bind("<Button-1>", self.on_click)
+
+    def layout(self, width, height):
+        # only runs on resize, month changes never move items
+        self.cell_width = width / 7
+        self.cell_height = (height - self.header_height) / 6
+
+        for col, (rect, text) in enumerate(self.headers):
+            x0 = col * self.cell_width
+            self.canvas.coords(rect, x0 + 1, 1, x0 + self.cell_width - 1, self.header_height - 1)
+            self.canvas.coords(text, x0 + self.cell_width / 2, self.header_height / 2)
+
+        for i, (rect, day, usage) in enumerate(self.items):
+            row, col = divmod(i, 7)
+            x0 = col * self.cell_width
+            y0 = self.header_height + row * self.cell_height
+            self.canvas.coords(rect, x0 + 1, y0 + 1, x0 + self.cell_width - 1, y0 + self.cell_height - 1)
+            self.canvas.coords(day, x0 + 5, y0 + 5)
+            self.canvas.coords(usage, x0 + 5, y0 + 25)
+
+    def show(self, cells):
+        for i, cell in enumerate(cells):
+            old = self.cells[i]
+            if cell == old:
+                continue
+            rect, day, usage = self.items[i]
+            if old is None or cell.fill != old.fill:
+                self.canvas.itemconfig(rect, fill=cell.fill)
+            if old is None or cell.day != old.day or cell.color != old.color:
+                self.canvas.itemconfig(day, text=cell.day, fill=cell.color)
+            if old is None or cell.usage != old.usage:
+                self.canvas.itemconfig(usage, text=cell.usage)
+            self.cells[i] = cell
+
+    def on_click(self, event):
+        if event.y < self.header_height:
+            return
+        col = int(event.x // self.cell_width)
+        row = int((event.y - self.header_height) // self.cell_height)
+        if 0 <= col < 7 and 0 <= row < 6:
+            cell = self.cells[row * 7 + col]
+            if cell is not None and cell.date:
+                self.on_select(cell.date)
+
+
+class YearCanvas:
+    # twelve mini months on one canvas, one square per day; draw() takes a fill color for every day
+    # of the year and creates all the squares in a single pass
+    title_height = 18
+    padding = 5
+
+    def __init__(self, parent, on_select, background="white", width=700, height=504):
+        self.on_select = on_select
+        self.background = background
+        self.canvas = tk.Canvas(parent, width=width, height=height, bg=background, highlightthickness=0)
+        self.year = None
+        self.fills = None
+        self.highlight = None
+        self.width, self.height = width, height
+
+        self.canvas.bind("<Configure>", self.on_resize)
+        self.canvas.bind("<Button-1>", self.on_click)
+
+    def geometry(self):
+        # block size of one month and the day square size that fits in it
+        block_width = self.width / 4
+        block_height = self.height / 3
+        square = min((block_width - 2 * self.padding) / 7,
+                     (block_height - self.title_height - self.padding) / 6)
+        return block_width, block_height, square
+
+    def draw(self, year, fills, highlight=None):
+        # fills holds one color per day of the year, highlight is a date to outline
+        self.year, self.fills, self.highlight = year, fills, highlight
+        self.canvas.delete("all")
+        block_width, block_height, square = self.geometry()
+
+        day_of_year = 0
+        for month in range(1, 13):
+            x0 = ((month - 1) % 4) * block_width + self.padding
+            y0 = ((month - 1) // 4) * block_height
+            self.canvas.create_text(x0, y0 + 2, anchor="nw", text=calendar.month_name[month],
+                                    font=("Arial", 9, "bold"))
+            y0 += self.title_height
+
+            first_weekday, days_in_month = calendar.monthrange(year, month)
+            for day in range(days_in_month):
+                row, col = divmod(first_weekday + day, 7)
+                x, y = x0 + col * square, y0 + row * square
+                outline = "blue" if highlight == date(year, month, day + 1) else self.background
+                self.canvas.create_rectangle(x, y, x + square - 1, y + square - 1,
+                                             fill=fills[day_of_year], outline=outline)
+                day_of_year += 1
+
+    def on_resize(self, event):
+        self.width, self.height = event.width, event.height
+        if self.year is not None:
+            self.draw(self.year, self.fills, self.highlight)
+
+    def on_click(self, event):
+        if self.year is None:
+            return
+        block_width, block_height, square = self.geometry()
+        col, row = int(event.x // block_width), int(event.y // block_height)
+        if not (0 <= col < 4 and 0 <= row < 3):
+            return
+
+        month = row * 4 + col + 1
+        x = event.x - col * block_width - self.padding
+        y = event.y - row * block_height - self.title_height
+        if x < 0 or y < 0:
+            return
+        first_weekday, days_in_month = calendar.monthrange(self.year, month)
+        day = int(y // square) * 7 + int(x // square) - first_weekday + 1
+        if int(x // square) < 7 and 1 <= day <= days_in_month:
+            self.on_select(date(self.year, month, day).isoformat())